@@ -0,0 +1,249 @@
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from Pallets import Pallets
+from Swarm import Swarm
+from Search_Monitor import Search_Monitor
+from Synthetic_Data import generate_dataset
+
+FILE = "data/cwk_train.csv"
+BASELINE = "data/benchmark_baseline.json"
+
+SEED = 3910
+
+# Metrics where a lower value is better; for every other metric higher is better
+LOWER_IS_BETTER = ['Startup Time', 'Cached Startup Time', 'Peak Memory', 'Run Time', 'Weight Error']
+
+def make_dataset(directory: str, days: int, seed = SEED, features = None):
+    """
+    Write a dataset of the requested number of days for benchmarking, by resampling the days of the training file
+    with a little noise, or if features is given a synthetic dataset with that many measurements.
+
+    Parameters:
+    directory: the directory to write the file to
+    days: number of days (rows) to generate
+    seed (optional): seed for the resampling. Default SEED
+    features (optional): number of measurements per day in a synthetic dataset. Default None (resample the training file)
+
+    Returns: a list containing the location of the CSV or .npy file, followed by the planted weights of a synthetic
+    dataset (or None)
+    """
+    if features is not None:
+        file_name = os.path.join(directory, f"benchmark_{days}_{features}.npy")
+        return [file_name, generate_dataset(file_name, days, features, seed)]
+
+    rng = np.random.default_rng(seed)
+    source = Pallets(FILE, cache=False).days
+    rows = source[rng.integers(len(source), size=days)]
+    rows = rows * rng.uniform(0.9, 1.1, rows.shape)
+
+    file_name = os.path.join(directory, f"benchmark_{days}.csv")
+    np.savetxt(file_name, rows, delimiter=",", fmt="%.6f")
+
+    return [file_name, None]
+
+def measure(function):
+    """
+    Call a function and time it.
+
+    Returns: a list containing the function's result followed by its run time (seconds)
+    """
+    start_time = time.perf_counter()
+    result = function()
+
+    return [result, time.perf_counter() - start_time]
+
+def measure_peak_memory(function):
+    """
+    Call a function while tracing memory allocations. Tracing slows Python code down considerably, so nothing should
+    be timed in the same call.
+
+    Returns: the function's peak memory use (bytes)
+    """
+    tracemalloc.start()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak_memory
+
+def benchmark_startup(file_name: str):
+    """
+    Time constructing a pallet problem, both from a freshly written CSV file and from its binary cache, and measure
+    the peak memory use of parsing the file.
+    """
+    startup_time = measure(lambda: Pallets(file_name))[1]
+    cached_startup_time = measure(lambda: Pallets(file_name))[1]
+    peak_memory = measure_peak_memory(lambda: Pallets(file_name, cache=False))
+
+    return {'Startup Time': startup_time, 'Cached Startup Time': cached_startup_time, 'Peak Memory': peak_memory}
+
+def benchmark_weight_recovery(pallet_prob: Pallets, planted_weights: list):
+    """
+    Time solving a synthetic dataset directly and measure how far the solution is from its planted weights.
+    """
+    (best_cost, solution), run_time = measure(lambda: pallet_prob.solve_least_absolute_deviations())
+    peak_memory = measure_peak_memory(lambda: pallet_prob.solve_least_absolute_deviations())
+
+    return {
+        'Run Time': run_time,
+        'Peak Memory': peak_memory,
+        'Weight Error': float(np.abs(np.array(solution) - planted_weights).max()),
+        'Best Cost': best_cost,
+    }
+
+def benchmark_evaluate_cost(pallet_prob: Pallets, run_time: float):
+    """
+    Measure how many single-solution evaluations evaluate_cost performs per second.
+    """
+    pallet_prob.seed(SEED)
+    solution = pallet_prob.generate_random_solution()
+    evaluations = 0
+
+    end_time = time.perf_counter() + run_time
+    start_time = time.perf_counter()
+    while time.perf_counter() < end_time:
+        pallet_prob.evaluate_cost(solution)
+        evaluations += 1
+
+    return {'Evaluations Per Second': evaluations / (time.perf_counter() - start_time)}
+
+def benchmark_search(pallet_prob: Pallets, search):
+    """
+    Run a search with a Search_Monitor attached and report its throughput, then run it again with memory tracing to
+    report its peak memory use.
+
+    Parameters:
+    pallet_prob: the instance of the pallet problem searched
+    search: a function taking a Search_Monitor and running the search with it
+
+    Returns: a dictionary of metrics, leaving out Iterations Per Second if no iteration completed and Best Cost if nothing was scored
+    """
+    pallet_prob.seed(SEED)
+    monitor = Search_Monitor()
+    search(monitor)
+
+    pallet_prob.seed(SEED)
+    peak_memory = measure_peak_memory(lambda: search(Search_Monitor()))
+
+    results = {'Evaluations Per Second': monitor.evaluations_per_second()}
+    # A search stopped during its initialisation completes no iterations, and has no iteration rate to compare
+    if monitor.iterations > 0:
+        results['Iterations Per Second'] = monitor.iterations_per_second()
+    results['Peak Memory'] = peak_memory
+    # Nor, if it scored nothing, a best cost (which the baseline JSON could not hold as inf)
+    if math.isfinite(monitor.best_cost):
+        results['Best Cost'] = monitor.best_cost
+
+    return results
+
+def run_benchmarks(day_counts: list, swarm_sizes: list, run_time: float, features = None):
+    """
+    Run every benchmark on datasets of each size.
+
+    Parameters:
+    day_counts: list of dataset sizes (days) to benchmark
+    swarm_sizes: list of swarm sizes to benchmark the swarm searches with
+    run_time: length of time (seconds) to run each timed benchmark for
+    features (optional): benchmark on synthetic datasets with this many measurements per day. Default None (resample the training file)
+
+    Returns: a dictionary mapping benchmark names to dictionaries of metrics
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for days in day_counts:
+            file_name, planted_weights = make_dataset(directory, days, features=features)
+            results[f"startup/{days}"] = benchmark_startup(file_name)
+
+            pallet_prob = Pallets(file_name)
+            if planted_weights is not None:
+                results[f"solve_least_absolute_deviations/{days}"] = benchmark_weight_recovery(pallet_prob, planted_weights)
+            swarm = Swarm(pallet_prob)
+            subgradient_swarm = Swarm(pallet_prob, local_search_operator='subgradient')
+            results[f"evaluate_cost/{days}"] = benchmark_evaluate_cost(pallet_prob, run_time)
+            results[f"iterative_neighbourhood_search/{days}"] = benchmark_search(pallet_prob, lambda monitor: pallet_prob.iterative_neighbourhood_search(pallet_prob.generate_random_solution(), 1000, monitor))
+            results[f"subgradient_search/{days}"] = benchmark_search(pallet_prob, lambda monitor: pallet_prob.subgradient_search(pallet_prob.generate_random_solution(), 1000, monitor))
+            results[f"timed_random_search/{days}"] = benchmark_search(pallet_prob, lambda monitor: pallet_prob.timed_random_search(run_time, monitor=monitor))
+
+            for swarm_size in swarm_sizes:
+                results[f"timed_swarm_search/{days}/{swarm_size}"] = benchmark_search(pallet_prob, lambda monitor: swarm.timed_swarm_search(swarm_size, run_time, monitor=monitor))
+                results[f"timed_swarm_search_with_lsi/{days}/{swarm_size}"] = benchmark_search(pallet_prob, lambda monitor: swarm.timed_swarm_search_with_lsi(swarm_size, run_time, monitor=monitor))
+                results[f"timed_swarm_search_with_lsi/subgradient/{days}/{swarm_size}"] = benchmark_search(pallet_prob, lambda monitor: subgradient_swarm.timed_swarm_search_with_lsi(swarm_size, run_time, monitor=monitor))
+                results[f"timed_array_swarm_search/{days}/{swarm_size}"] = benchmark_search(pallet_prob, lambda monitor: swarm.timed_array_swarm_search(swarm_size, run_time, monitor=monitor))
+
+    return results
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float):
+    """
+    Compare benchmark results against a baseline.
+
+    A metric regresses when it is worse than the baseline by more than tolerance, as a fraction of the baseline value.
+    Best Cost is not compared, since it depends on run time rather than on throughput.
+
+    Returns: a list of descriptions of the regressions found
+    """
+    regressions = []
+
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            if metric == 'Best Cost' or name not in baseline or metric not in baseline[name]:
+                continue
+            baseline_value = baseline[name][metric]
+            if baseline_value == 0:
+                continue
+
+            if metric in LOWER_IS_BETTER:
+                change = (value - baseline_value) / baseline_value
+            else:
+                change = (baseline_value - value) / baseline_value
+
+            if change > tolerance:
+                regressions.append(f"{name} {metric}: {value:.4g} vs baseline {baseline_value:.4g} ({change:.0%} worse)")
+
+    return regressions
+
+def main(arguments = None):
+    parser = argparse.ArgumentParser(description="Benchmark the pallet problem search algorithms.")
+    parser.add_argument("--days", type=int, nargs="+", default=[20, 1000, 100000], help="dataset sizes (days) to benchmark")
+    parser.add_argument("--swarm-sizes", type=int, nargs="+", default=[30, 100, 500], help="swarm sizes to benchmark")
+    parser.add_argument("--features", type=int, default=None, help="benchmark on synthetic datasets with this many measurements per day")
+    parser.add_argument("--run-time", type=float, default=1.0, help="length of time (seconds) to run each timed benchmark for")
+    parser.add_argument("--baseline", default=BASELINE, help="location of the baseline results")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="fraction by which a metric may be worse than the baseline before it is flagged")
+    args = parser.parse_args(arguments)
+
+    results = run_benchmarks(args.days, args.swarm_sizes, args.run_time, args.features)
+
+    for name, metrics in results.items():
+        print(f"{name}: " + ", ".join(f"{metric} {value:.4g}" for metric, value in metrics.items()))
+
+    if args.save_baseline:
+        with open(args.baseline, mode='w') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline found at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, mode='r') as baseline_file:
+        regressions = compare_to_baseline(results, json.load(baseline_file), args.tolerance)
+
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from Pallets import Pallets
+from Swarm import Swarm
+
+# Pallet problems loaded by this process, keyed by file name, so that each worker only parses a dataset once
+_pallet_problems = {}
+
+def get_pallet_problem(file_name: str):
+    """
+    Return the pallet problem for a file, loading it the first time it is requested in this process.
+
+    Parameters:
+    file_name: a string specifying the location of a CSV file containing data for the pallet problem
+    """
+    if file_name not in _pallet_problems:
+        _pallet_problems[file_name] = Pallets(file_name)
+
+    return _pallet_problems[file_name]
+
+def trial_seeds(seed, runs: int):
+    """
+    Derive one independent seed per trial from a single experiment seed.
+
+    Parameters:
+    seed: the experiment seed, or None to derive the trial seeds from fresh operating system entropy
+    runs: number of trials
+
+    Returns: a list of runs seeds, in trial order
+    """
+    # Even unseeded trials get their own seeds: worker processes forked from this one would otherwise all start with
+    # a copy of the same NumPy generator state, and repeat each other's trials
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(runs)]
+
+def run_trials(trial, runs: int, workers = 1, seed = None, on_result = None):
+    """
+    Run a number of independent trials, optionally fanned out across a pool of worker processes.
+
+    Parameters:
+    trial: a picklable function taking a trial seed as its only argument and returning the trial's result
+    runs: number of trials
+    workers (optional): number of worker processes, or None for one per CPU. Default 1 (run in this process)
+    seed (optional): experiment seed from which a deterministic seed is derived for every trial. Default None (fresh seeds)
+    on_result (optional): a function called with each trial's result as soon as it (and every earlier trial) has finished. Default None
+
+    Returns: a list of the trial results, in trial order
+    """
+    seeds = trial_seeds(seed, runs)
+    results = []
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    if workers == 1:
+        for trial_seed in seeds:
+            results.append(trial(trial_seed))
+            if on_result is not None:
+                on_result(results[-1])
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(trial, seeds):
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    return results
+
+def swarm_trial(file_name: str, LSI: bool, swarm_size: int, run_time: int, cog_coefficient, array_engine, max_evaluations, local_search_operator, trial_seed):
+    """
+    Run a single PSO or PSOwLSI search.
+
+    Returns: a list containing the best solution found, followed by its cost, the number of evaluations performed and
+    the reason the search stopped
+    """
+    pallet_prob = get_pallet_problem(file_name)
+    pallet_prob.seed(trial_seed)
+    swarm = Swarm(pallet_prob, cog_coefficient, local_search_operator)
+
+    if array_engine == True:
+        return swarm.timed_array_swarm_search(swarm_size, run_time, max_evaluations, LSI=LSI)
+    elif LSI == True:
+        return swarm.timed_swarm_search_with_lsi(swarm_size, run_time, max_evaluations)
+    else:
+        return swarm.timed_swarm_search(swarm_size, run_time, max_evaluations)
+
+def random_search_trial(file_name: str, run_time: int, lower, upper, max_evaluations, block_size, trial_seed):
+    """
+    Run a single timed random search, scoring candidates in blocks if block_size is given.
+
+    Returns: a list containing the cost of the best solution found followed by the solution, the number of
+    evaluations performed and the reason the search stopped
+    """
+    pallet_prob = get_pallet_problem(file_name)
+    pallet_prob.seed(trial_seed)
+
+    if block_size is not None:
+        return pallet_prob.block_random_search(run_time, lower, upper, max_evaluations, block_size=block_size)
+
+    return pallet_prob.timed_random_search(run_time, lower, upper, max_evaluations)
+
+def run_swarm_trials(file_name: str, runs: int, LSI: bool, swarm_size: int, run_time: int, cog_coefficient = 1.1193, array_engine = False, workers = 1, seed = None, max_evaluations = None, on_result = None, local_search_operator = 'neighbourhood'):
+    """
+    Run a number of independent swarm searches, optionally in parallel.
+
+    Returns: a list of [gbest, gbest_cost, evaluations, stop reason] results, in trial order
+    """
+    # Load (and if necessary cache) the data once up front so that the workers all map the same binary cache
+    get_pallet_problem(file_name)
+    trial = partial(swarm_trial, file_name, LSI, swarm_size, run_time, cog_coefficient, array_engine, max_evaluations, local_search_operator)
+    return run_trials(trial, runs, workers, seed, on_result)
+
+def run_random_search_trials(file_name: str, runs: int, run_time: int, lower = -1.0, upper = 1.0, workers = 1, seed = None, max_evaluations = None, block_size = None, on_result = None):
+    """
+    Run a number of independent timed random searches, optionally in parallel and in blocks.
+
+    Returns: a list of [best_cost, best_solution, evaluations, stop reason] results, in trial order
+    """
+    get_pallet_problem(file_name)
+    trial = partial(random_search_trial, file_name, run_time, lower, upper, max_evaluations, block_size)
+    return run_trials(trial, runs, workers, seed, on_result)
@@ -0,0 +1,110 @@
+import multiprocessing
+import queue
+
+from Pallets import Pallets
+from Swarm import Swarm
+from Stopping_Criteria import Stopping_Criteria
+from Experiment_Runner import trial_seeds
+
+# Coefficients used for any island that doesn't set its own
+DEFAULT_COEFFICIENTS = {'Inertial': 0.721, 'Cognitive': 1.1193, 'Social': 1.1193}
+
+TOPOLOGIES = ['ring', 'fully connected']
+
+def migration_targets(island: int, islands: int, topology: str):
+    """
+    Return the islands that an island sends its best position to.
+
+    Parameters:
+    island: index of the sending island
+    islands: number of islands
+    topology: 'ring' to send to the next island only, or 'fully connected' to send to every other island
+    """
+    if topology == 'ring':
+        return [(island + 1) % islands] if islands > 1 else []
+    elif topology == 'fully connected':
+        return [target for target in range(islands) if target != island]
+    else:
+        raise ValueError(f"Unknown migration topology {topology!r}, expected one of {TOPOLOGIES}")
+
+def island_search(file_name: str, island: int, coefficients: dict, swarm_size: int, run_time, max_evaluations, migration_interval: int, topology: str, inboxes: list, results, seed):
+    """
+    Run one island's swarm in its own process, exchanging best positions with the other islands every
+    migration_interval iterations, then put [island, gbest, gbest_cost, evaluations] on the results queue.
+    """
+    pallet_prob = Pallets(file_name)
+    pallet_prob.seed(seed)
+
+    swarm = Swarm(pallet_prob, coefficients['Cognitive'], inertial_coefficient=coefficients['Inertial'], social_coefficient=coefficients['Social'])
+
+    # Migrants still queued when an island finishes are simply dropped
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+
+    targets = migration_targets(island, len(inboxes), topology)
+    criteria = Stopping_Criteria()
+    criteria.start(pallet_prob, run_time, max_evaluations)
+    swarm.initialise_array_swarm(swarm_size)
+    iterations = 0
+
+    while criteria.check(swarm.gbest_cost) is None:
+        swarm.step_array_swarm()
+        iterations += 1
+
+        if iterations % migration_interval == 0:
+            for target in targets:
+                inboxes[target].put((swarm.gbest.tolist(), float(swarm.gbest_cost)))
+
+            while True:
+                try:
+                    position, cost = inboxes[island].get_nowait()
+                except queue.Empty:
+                    break
+                swarm.receive_migrant(position, cost)
+
+    results.put([island, swarm.gbest.tolist(), float(swarm.gbest_cost), pallet_prob.evaluations])
+
+def island_swarm_search(file_name: str, island_coefficients: list, swarm_size: int, run_time, max_evaluations = None, migration_interval = 10, topology = 'ring', seed = None):
+    """
+    Conduct an island-model PSO search: one array-backed swarm per island, each in its own process with its own
+    coefficients, periodically sending its best position to other islands over multiprocessing queues.
+
+    Parameters:
+    file_name: a string specifying the location of a CSV file containing data for the pallet problem
+    island_coefficients: a list with one dictionary per island, whose 'Inertial', 'Cognitive' and 'Social' entries
+    override DEFAULT_COEFFICIENTS
+    swarm_size: number of particles in each island's swarm
+    run_time: length of time (seconds) to search for, or None to stop on max_evaluations alone
+    max_evaluations (optional): the maximum number of cost evaluations each island may perform. Default None (no limit)
+    migration_interval (optional): number of iterations between migrations. Default 10
+    topology (optional): 'ring' or 'fully connected'. Default 'ring'
+    seed (optional): experiment seed from which a deterministic seed is derived for every island. Default None. Since
+    migrants arrive whenever the sending process gets to them, seeded runs are only repeatable without migration
+
+    Returns: a list containing the best solution found by any island, followed by its cost and the total number of
+    evaluations performed
+    """
+    islands = len(island_coefficients)
+    migration_targets(0, islands, topology)
+    # Load (and if necessary cache) the data once so that every island maps the same binary cache
+    Pallets(file_name)
+
+    inboxes = [multiprocessing.Queue() for x in range(islands)]
+    results = multiprocessing.Queue()
+    seeds = trial_seeds(seed, islands)
+
+    processes = []
+    for island in range(islands):
+        coefficients = dict(DEFAULT_COEFFICIENTS, **island_coefficients[island])
+        process = multiprocessing.Process(target=island_search, args=(file_name, island, coefficients, swarm_size, run_time, max_evaluations, migration_interval, topology, inboxes, results, seeds[island]))
+        process.start()
+        processes.append(process)
+
+    island_results = [results.get() for x in range(islands)]
+    for process in processes:
+        process.join()
+
+    best = min(island_results, key = lambda result : result[2])
+    evaluations = sum(result[3] for result in island_results)
+
+    return [best[1], best[2], evaluations]
@@ -1,53 +1,279 @@
+import os
+import copy
+import glob
 import random
 import math
 import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Stopping_Criteria import Stopping_Criteria
+
+# Problems loaded by worker processes, by source file, so that each worker loads (or maps) a file's days only once
+_worker_problems = {}
 
 class Pallets:
     """
     Represents an instance of the pallet problem and provides the functionality required to
     generate and evaluate valid solutions.
+
+    The coursework data has 13 demand measurements per day, but any number is supported: a solution has one weight per
+    measurement column in the data (weight_count).
     """
-    def __init__(self, file_name):
+
+    # Number of days in the first block scored by an evaluation with a cutoff; each later block is twice the size
+    FIRST_DAY_BLOCK = 64
+
+    # Largest number of (day, candidate) estimates evaluate_costs computes at once; larger batches are split into blocks of days
+    EVALUATION_BLOCK_ELEMENTS = 2**22
+
+    # Largest condition number of the normal equations solve_weighted_least_squares solves directly, rather than falling back to lstsq
+    NORMAL_EQUATIONS_CONDITION_LIMIT = 1e10
+
+    # Operators the local searches can move with: single-weight Gaussian perturbations, or steps along the subgradient
+    LOCAL_SEARCH_OPERATORS = ['neighbourhood', 'subgradient']
+
+    # Initial length of a subgradient step, and the factors it is multiplied by after a successful or failed step
+    SUBGRADIENT_STEP = 2.0
+    SUBGRADIENT_STEP_GROWTH = 1.5
+    SUBGRADIENT_STEP_SHRINK = 0.5
+
+    def __init__(self, file_name, dtype = np.float64, cache = True):
         """
         Initialise an instance of the pallet problem with data from a file.
 
         Parameters:
-        file_name: a string specifying the location of a CSV file which contains one or more days (as rows) with their known demand followed by estimates
+        file_name: a string specifying the location of a CSV file which contains one or more days (as rows) with their known
+        demand followed by estimates, or of a .npy file holding the same matrix, e.g. from Synthetic_Data.generate_dataset
+        dtype (optional): the floating point type the days are held in, np.float64 or np.float32. Default np.float64
+        cache (optional): whether to load the days through a memory-mapped binary cache of the CSV file. Default True
+        """
+        if file_name.endswith(".npy"):
+            self.days = self.load_binary_data(file_name, dtype)
+        elif cache:
+            self.days = self.load_cached_data(file_name, dtype)
+        else:
+            self.days = self.get_data_from_file(file_name, dtype)
+        # Where the days were loaded from, so that worker processes can load them again rather than being sent them
+        self.source = [file_name, np.dtype(dtype).name, cache]
+        # Number of days loaded from the source; the rest were appended. None once appended days have been reordered
+        self.source_day_count = len(self.days)
+        # Spare capacity for appended days, allocated by append_days
+        self.day_buffer = None
+        self.set_views()
+        self.rng = np.random.default_rng()
+        # Running total of the candidate solutions evaluated against this problem
+        self.evaluations = 0
+        # Number of those evaluations abandoned early against a cutoff
+        self.abandoned_evaluations = 0
+
+    def share(self):
+        """
+        Return a new instance of the problem sharing this one's days (read only), with its own random number generator
+        and evaluation counters, so that several searches can run concurrently in threads of one process.
+        """
+        shared = copy.copy(self)
+        # Appending to the copy must not write into this problem's spare capacity
+        shared.day_buffer = None
+        shared.rng = np.random.default_rng()
+        shared.evaluations = 0
+        shared.abandoned_evaluations = 0
+
+        return shared
+
+    def seed(self, seed):
+        """
+        Seed the random number generators used to generate and perturb solutions, so that a search can be repeated.
+
+        Parameters:
+        seed: an integer seed, or None to seed from the operating system
+        """
+        random.seed(seed)
+        self.rng = np.random.default_rng(seed)
+
+    def evaluate_costs(self, weights_matrix):
         """
-        self.days = self.get_data_from_file(file_name)
+        Evaluate the average estimation error of several candidate solutions at once.
 
-    def evaluate_cost(self, weights):
+        Each row of weights_matrix is a set of weight_count weights. The estimates for every day and every candidate are
+        computed with a single matrix product, so scoring K candidates costs one pass over the data rather than K. On
+        large datasets the product is computed a block of days at a time, so that the (days x K) intermediate stays
+        within EVALUATION_BLOCK_ELEMENTS.
+
+        Parameters:
+        weights_matrix: a (K x weight_count) array, or a list of K lists of weight_count floats
+
+        Returns: a NumPy array containing the K average errors, in row order
+        """
+        weights_matrix = np.asarray(weights_matrix, dtype=self.days.dtype)
+        self.evaluations += len(weights_matrix)
+        day_count = len(self.days)
+        block = max(1, self.EVALUATION_BLOCK_ELEMENTS // max(1, len(weights_matrix)))
+
+        if day_count <= block:
+            errors = self.estimates @ weights_matrix.T - self.demand[:, None]
+            return np.abs(errors).mean(axis=0, dtype=np.float64)
+
+        total_errors = np.zeros(len(weights_matrix))
+        for start in range(0, day_count, block):
+            errors = self.estimates[start:start + block] @ weights_matrix.T - self.demand[start:start + block, None]
+            total_errors += np.abs(errors).sum(axis=0, dtype=np.float64)
+
+        return total_errors / day_count
+
+    def evaluate_cost(self, weights, cutoff = None):
         """
         Evaluate the average estimation error across a list of days for the pallet problem.
 
-        Given a list of 13 weights, calculate the average error in estimating demand when these weights are
-        combined, in list order, with the 13 demand measurements for each day, over all days included
+        Given a list of weight_count weights, calculate the average error in estimating demand when these weights are
+        combined, in list order, with the weight_count demand measurements for each day, over all days included
         in the data provided.
 
+        If a cutoff is given, days are scored in blocks (in the current day order) and the evaluation is abandoned as
+        soon as the running total of errors shows that the average cannot be lower than the cutoff.
+
         Parameters:
-        weights: a list containing 13 floats to be combined with the day's demand estimates
+        weights: a list containing weight_count floats to be combined with the day's demand estimates
+        cutoff (optional): the cost the solution has to beat, e.g. the current best or pbest cost. Default None
+
+        Returns: the average error, or math.inf if the evaluation was abandoned because it could not beat the cutoff
         """
-        costs = []
-        for day in self.days:
-            costs.append(self.evaluate_cost_for_one_day(day, weights))
-        
-        return sum(costs) / len(self.days)
+        if cutoff is None:
+            return float(self.evaluate_costs([weights])[0])
+
+        self.evaluations += 1
+        cost = self.cost_with_cutoff(weights, cutoff)
+        if cost == math.inf:
+            self.abandoned_evaluations += 1
+
+        return cost
+
+    def cost_with_cutoff(self, weights, cutoff = math.inf):
+        """
+        Score a solution in blocks of days as described in evaluate_cost, without updating the evaluation counters.
+
+        Only reads the days, and spends its time in NumPy kernels that release the GIL, so it can be called from several
+        threads at once; the caller is responsible for counting the evaluations.
+
+        Returns: the average error, or math.inf if the evaluation was abandoned because it could not beat the cutoff
+        """
+        weights = np.asarray(weights, dtype=self.days.dtype)
+        day_count = len(self.days)
+        error_limit = cutoff * day_count
+        total_error = 0.0
+
+        start = 0
+        block = self.FIRST_DAY_BLOCK
+        while start < day_count:
+            end = start + block
+            total_error += np.abs(self.estimates[start:end] @ weights - self.demand[start:end]).sum(dtype=np.float64)
+            if total_error >= error_limit:
+                return math.inf
+            start = end
+            block *= 2
+
+        return float(total_error / day_count)
+
+    def order_days(self, order):
+        """
+        Reorder the days held by the problem. Costs are unaffected, but evaluations with a cutoff are abandoned sooner
+        when the days with the largest errors come first.
+
+        Parameters:
+        order: a sequence of day indices giving the new order
+        """
+        if self.source_day_count is not None and len(self.days) > self.source_day_count:
+            self.source_day_count = None
+        self.days = np.ascontiguousarray(self.days[np.asarray(order)])
+        self.day_buffer = None
+        self.set_views()
+
+    def set_views(self):
+        """
+        Point the demand and estimates views at the current days matrix: column 0 is the known demand, columns
+        1 to weight_count the demand measurements.
+        """
+        self.demand = self.days[:, 0]
+        self.estimates = self.days[:, 1:]
+        # Number of weights in a solution: one per measurement
+        self.weight_count = self.estimates.shape[1]
+
+    def append_days(self, days):
+        """
+        Add new days to the problem without reloading the existing ones.
+
+        The days are held in a buffer with spare capacity that doubles when it fills, so appending costs time proportional
+        to the new days. Costs computed before the append can be brought up to date with update_costs.
+
+        Parameters:
+        days: a (days x weight_count + 1) array, or list of lists, laid out as described in get_data_from_file
+        """
+        days = np.asarray(days, dtype=self.days.dtype).reshape(-1, self.days.shape[1])
+        day_count = len(self.days)
+        new_day_count = day_count + len(days)
+
+        if self.day_buffer is None or len(self.day_buffer) < new_day_count:
+            self.day_buffer = np.empty((max(new_day_count, 2 * day_count), self.days.shape[1]), dtype=self.days.dtype)
+            self.day_buffer[:day_count] = self.days
+
+        self.day_buffer[day_count:new_day_count] = days
+        self.days = self.day_buffer[:new_day_count]
+        self.set_views()
+
+    def append_days_from_file(self, file_name):
+        """
+        Add the days in a CSV or .npy file, e.g. the latest day's demand data, to the problem. See append_days.
+        """
+        if file_name.endswith(".npy"):
+            self.append_days(self.load_binary_data(file_name, self.days.dtype))
+        else:
+            self.append_days(self.get_data_from_file(file_name, self.days.dtype))
+
+    def update_costs(self, weights_matrix, costs, previous_day_count):
+        """
+        Bring the costs of several solutions up to date after days have been appended, scoring only the new days.
+
+        The average error over all days is the old average, weighted by the old number of days, plus the errors on the
+        new days, divided by the new number of days.
+
+        Parameters:
+        weights_matrix: a (K x weight_count) array, or a list of K lists of weight_count floats
+        costs: the K solutions' costs over the first previous_day_count days
+        previous_day_count: the number of days the costs were computed over
+
+        Returns: a NumPy array containing the K average errors over all days
+        """
+        weights_matrix = np.asarray(weights_matrix, dtype=self.days.dtype)
+        self.evaluations += len(weights_matrix)
+        new_errors = np.abs(self.estimates[previous_day_count:] @ weights_matrix.T - self.demand[previous_day_count:, None]).sum(axis=0, dtype=np.float64)
+
+        return (np.asarray(costs) * previous_day_count + new_errors) / len(self.days)
+
+    def order_days_by_error(self, weights):
+        """
+        Reorder the days so that those with the largest estimation error for a reference solution come first.
+
+        Parameters:
+        weights: a list containing weight_count floats, e.g. the current best solution
+        """
+        self.order_days(np.argsort(-np.abs(self.residuals(weights)), kind="stable"))
 
     def evaluate_cost_for_one_day(self, day: list, weights: list):
         """
-        Evaluate the estimation error for one day when combining the day's estimates with a set of 13 weights.
+        Evaluate the estimation error for one day when combining the day's estimates with a set of weight_count weights.
 
-        Given one day, consisting of the known demand for the day followed by 13 demand measurements for that
-        day, evaluate the error in estimating demand by combining the supplied 13 weights, in list order, with the demand
+        Given one day, consisting of the known demand for the day followed by weight_count demand measurements for that
+        day, evaluate the error in estimating demand by combining the supplied weight_count weights, in list order, with the demand
         measurements and then calculating the difference between the resulting estimation and the known demand.
 
         Parameters:
-        day: a list containing the known demand at the end of the day followed by 13 demand estimates
-        weights: a list containing 13 floats to be combined with the day's demand estimates
+        day: a list containing the known demand at the end of the day followed by weight_count demand estimates
+        weights: a list containing weight_count floats to be combined with the day's demand estimates
         """
         weighted_values = []
 
-        for i in range(13):
+        for i in range(len(day) - 1):
             weighted_values.append(weights[i] * day[i+1])
         
         estimate = sum(weighted_values)
@@ -56,46 +282,121 @@ class Pallets:
 
     def generate_random_solution(self, lower = -1.0, upper = 1.0):
         """
-        Return a random solution to the pallet problem consisting of a list of 13 values.
+        Return a random solution to the pallet problem consisting of a list of weight_count values.
 
-        Generate a list of 13 random floating point values, where lower <= value <= upper, representing a possible solution to the
-        pallet demand problem.
+        Generate a list of weight_count random floating point values, where lower <= value <= upper, representing a possible
+        solution to the pallet demand problem.
 
         Parameters:
-        iterations: the number of solutions to be generated
         lower (optional): the lower bound above which each weight is generated. Default -1.0
         upper (optional): the upper bound below which each weight is generated. Default 1.0
         """
         params = []
 
-        for i in range(13):
+        for i in range(self.weight_count):
             params.append(random.uniform(lower, upper))
 
         return params
 
+    def generate_random_solutions(self, count, lower = -1.0, upper = 1.0):
+        """
+        Return a (count x weight_count) array of random solutions to the pallet problem, one per row.
 
-    def get_data_from_file(self, file_name):
+        Parameters:
+        count: the number of solutions to be generated
+        lower (optional): the lower bound above which each weight is generated. Default -1.0
+        upper (optional): the upper bound below which each weight is generated. Default 1.0
+        """
+        return self.rng.uniform(lower, upper, (count, self.weight_count))
+
+    def get_data_from_file(self, file_name, dtype = np.float64):
         """ 
         Load data for the pallet problem from a CSV file.
 
-        Given the name of a CSV file containing data for the pallets problem, return a list *days*
-        of days. Each day is a list consisting of the known demand at the end of the day (index 0) followed
-        by 13 demand measurements (indices 1-13).
+        Given the name of a CSV file containing data for the pallets problem, return a contiguous matrix *days*
+        with one row per day. Each row consists of the known demand at the end of the day (column 0) followed
+        by its demand measurements (columns 1 onward), one per weight of a solution.
 
         Parameters:
         file_name: a string specifying the location of a CSV file which contains one or more days (as rows) with their known demand followed by estimates
+        dtype (optional): the floating point type of the returned matrix. Default np.float64
         """
-        csv = open(file_name, 'r')
-        days = []
-        for line in csv:
-            day = line.rstrip().split(",")
-            for i in range(len(day)):
-                day[i] = float(day[i])
-            days.append(day)   
+        days = np.loadtxt(file_name, delimiter=",", dtype=dtype, ndmin=2)
         #print(f"Data from file: {days}")
+        return np.ascontiguousarray(days)
+
+    def load_binary_data(self, file_name, dtype = np.float64):
+        """
+        Load data for the pallet problem from a .npy file holding a matrix laid out as described in get_data_from_file.
+
+        The file is memory-mapped (read only), so only the days used are read from disk. If it holds a different floating
+        point type from dtype, it is converted in memory instead.
+
+        Parameters:
+        file_name: a string specifying the location of the .npy file
+        dtype (optional): the floating point type of the returned matrix. Default np.float64
+        """
+        days = np.load(file_name, mmap_mode="r")
+        if days.ndim == 1:
+            days = days.reshape(1, -1)
+        if days.dtype != np.dtype(dtype):
+            days = np.ascontiguousarray(days, dtype=dtype)
+
         return days
 
-    def random_search(self, iterations, lower = -1.0, upper = 1.0):
+    def cache_file_name(self, file_name, dtype = np.float64, size = None):
+        """
+        Return the location of the binary cache for a CSV file of pallet problem data. The name records the size of the
+        CSV file it was built from, or is a glob pattern matching every size if size is None.
+        """
+        return f"{file_name}.{'*' if size is None else size}.{np.dtype(dtype).name}.npy"
+
+    def load_cached_data(self, file_name, dtype = np.float64):
+        """
+        Load data for the pallet problem from a CSV file through a binary cache.
+
+        The first time a file is loaded, it is parsed and written next to the CSV file as a .npy file whose modification
+        time is set to match the CSV file, and whose name records the CSV file's size. Later loads memory-map the cache
+        (read only), so processes using the same data share one copy of it. The cache is rebuilt, replacing any older
+        cache of the file, whenever the CSV file's modification time or size changes, so that a file replaced with its
+        modification time preserved (e.g. by cp -p) is still noticed. If the cache can't be written, the parsed data is
+        returned instead.
+
+        Parameters:
+        file_name: a string specifying the location of a CSV file which contains one or more days (as rows) with their known demand followed by estimates
+        dtype (optional): the floating point type of the returned matrix. Default np.float64
+
+        Returns: a (days x weight_count + 1) matrix laid out as described in get_data_from_file
+        """
+        source = os.stat(file_name)
+        cache_name = self.cache_file_name(file_name, dtype, source.st_size)
+
+        if os.path.exists(cache_name) and os.stat(cache_name).st_mtime_ns == source.st_mtime_ns:
+            return np.load(cache_name, mmap_mode="r")
+
+        days = self.get_data_from_file(file_name, dtype)
+
+        # Write to a temporary file first so that concurrent loaders never see a partial cache
+        temporary_name = f"{cache_name}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_name, "wb") as cache_file:
+                np.save(cache_file, days)
+            os.utime(temporary_name, ns=(source.st_atime_ns, source.st_mtime_ns))
+            os.replace(temporary_name, cache_name)
+            for old_cache_name in glob.glob(self.cache_file_name(glob.escape(file_name), dtype)):
+                if old_cache_name != cache_name:
+                    try:
+                        os.remove(old_cache_name)
+                    except OSError:
+                        pass
+        except OSError:
+            if os.path.exists(temporary_name):
+                os.remove(temporary_name)
+            return days
+
+        return np.load(cache_name, mmap_mode="r")
+
+    def random_search(self, iterations, lower = -1.0, upper = 1.0, log_interval = 1):
         """
         Generate random solutions for the specified number of iterations and return the best found.
 
@@ -103,6 +404,7 @@ class Pallets:
         iterations: the number of solutions to be generated
         lower (optional): the lower bound above which each weight is generated. Default -1.0
         upper (optional): the upper bound below which each weight is generated. Default 1.0
+        log_interval (optional): print every log_interval-th solution and its cost, or None to print none. Default 1
 
         Returns: the best solution found
         """
@@ -112,7 +414,8 @@ class Pallets:
         for i in range(iterations):
             solution = self.generate_random_solution(lower, upper)
             cost = self.evaluate_cost(solution)
-            print(f"Solution: {solution} Cost: {cost}")
+            if log_interval is not None and i % log_interval == 0:
+                print(f"Solution: {solution} Cost: {cost}")
 
             if cost < best_cost:
                 best_cost = cost
@@ -125,35 +428,196 @@ class Pallets:
         return best_solution
 
     
-    def timed_random_search(self, run_time, lower = -1.0, upper = 1.0):
+    def timed_random_search(self, run_time, lower = -1.0, upper = 1.0, max_evaluations = None, initial_solution = None, monitor = None, stopping = None):
         """
-        Repeatedly generate random solutions for the specified time period and return the best found.
+        Repeatedly generate random solutions for the specified time period, or number of evaluations, and return the best found.
 
         Parameters:
-        run_time: length of time to search for
+        run_time: length of time to search for, or None to stop on max_evaluations alone
         lower (optional): the lower bound above which each weight is generated. Default -1.0
         upper (optional): the upper bound below which each weight is generated. Default 1.0
+        max_evaluations (optional): the maximum number of cost evaluations to perform. Default None (no limit)
+        initial_solution (optional): a solution to start from as the best found, e.g. from solve_least_absolute_deviations. Default None
+        monitor (optional): a Search_Monitor to record phase times and the convergence trace in. Default None
+        stopping (optional): a Stopping_Criteria adding convergence criteria, e.g. a target cost. Default None
 
-        Returns: a list containing the cost of the best solution found followed by the solution
+        Returns: a list containing the cost of the best solution found followed by the solution, the number of
+        evaluations performed and the reason the search stopped
 
         """
         best_cost = math.inf
         best_solution = []
 
-        end_time = time.time() + run_time
+        criteria = stopping if stopping is not None else Stopping_Criteria()
+        criteria.start(self, run_time, max_evaluations)
+        if monitor is not None:
+            monitor.start(self)
+
+        if initial_solution is not None:
+            best_solution = list(initial_solution)
+            best_cost = self.evaluate_cost(best_solution)
+
+        while True:
+            reason = criteria.check(best_cost)
+            if reason is not None:
+                break
 
-        while time.time() < end_time:
             solution = self.generate_random_solution(lower, upper)
-            cost = self.evaluate_cost(solution)
+            if monitor is not None:
+                monitor.lap("generation")
+            cost = self.evaluate_cost(solution, best_cost)
 
             if cost < best_cost:
                 best_cost = cost
                 best_solution = solution
 
-        return [best_cost, best_solution]
+            if monitor is not None:
+                monitor.lap("evaluation")
+                monitor.iteration(best_cost, best_solution)
+
+        if monitor is not None:
+            monitor.finish()
+
+        return [best_cost, best_solution, criteria.evaluations(), reason]
 
 
-    def iterative_neighbourhood_search(self, solution, iterations):
+    def block_random_search(self, run_time, lower = -1.0, upper = 1.0, max_evaluations = None, initial_solution = None, block_size = 4096, log_interval = None, monitor = None, stopping = None):
+        """
+        Generate random solutions in blocks for the specified time period, or number of evaluations, and return the best found.
+
+        Behaves like timed_random_search, but each block of block_size candidates is drawn from the problem's seeded
+        generator in one call and scored with one batched evaluation, keeping only the running best.
+
+        Parameters:
+        run_time: length of time to search for, or None to stop on max_evaluations alone
+        lower (optional): the lower bound above which each weight is generated. Default -1.0
+        upper (optional): the upper bound below which each weight is generated. Default 1.0
+        max_evaluations (optional): the maximum number of cost evaluations to perform. Default None (no limit)
+        initial_solution (optional): a solution to start from as the best found, e.g. from solve_least_absolute_deviations. Default None
+        block_size (optional): number of candidates generated and scored together. Default 4096
+        log_interval (optional): print the best cost found so far every log_interval seconds, or None to print nothing. Default None
+        monitor (optional): a Search_Monitor to record phase times and the convergence trace in, with one iteration per block. Default None
+        stopping (optional): a Stopping_Criteria adding convergence criteria, e.g. a target cost. Default None
+
+        Returns: a list containing the cost of the best solution found followed by the solution, the number of
+        evaluations performed and the reason the search stopped
+        """
+        best_cost = math.inf
+        best_solution = []
+
+        criteria = stopping if stopping is not None else Stopping_Criteria()
+        criteria.start(self, run_time, max_evaluations)
+        next_log_time = time.time() + log_interval if log_interval is not None else None
+        if monitor is not None:
+            monitor.start(self)
+
+        if initial_solution is not None:
+            best_solution = list(initial_solution)
+            best_cost = self.evaluate_cost(best_solution)
+
+        while True:
+            reason = criteria.check(best_cost)
+            if reason is not None:
+                break
+
+            count = block_size
+            if max_evaluations is not None:
+                count = min(count, max_evaluations - criteria.evaluations())
+
+            solutions = self.generate_random_solutions(count, lower, upper)
+            if monitor is not None:
+                monitor.lap("generation")
+            costs = self.evaluate_costs(solutions)
+
+            best = np.argmin(costs)
+            if costs[best] < best_cost:
+                best_cost = float(costs[best])
+                best_solution = solutions[best].tolist()
+
+            if monitor is not None:
+                monitor.lap("evaluation")
+                monitor.iteration(best_cost, best_solution)
+
+            if next_log_time is not None and time.time() >= next_log_time:
+                print(f"Evaluations: {criteria.evaluations()} Best cost: {best_cost}")
+                next_log_time += log_interval
+
+        if monitor is not None:
+            monitor.finish()
+
+        return [best_cost, best_solution, criteria.evaluations(), reason]
+
+    def solve_least_absolute_deviations(self, iterations = 100, tolerance = 1e-9):
+        """
+        Directly compute the weights minimising the average estimation error, without a stochastic search.
+
+        The cost is the mean absolute error of a linear combination of the measurements, so the optimal weights are a
+        least absolute deviations regression of the known demand on the weight_count measurements. This is solved by iteratively
+        reweighted least squares: each iteration solves a weighted least squares problem in which every day is weighted
+        by the inverse of its current absolute residual (see solve_weighted_least_squares). The result can be used as a
+        reference optimum, or to seed timed_random_search or a Swarm search through their initial_solution parameter.
+
+        Parameters:
+        iterations (optional): the maximum number of reweighting iterations. Default 100
+        tolerance (optional): stop once no weight changes by more than this, relative to the largest weight. Default 1e-9
+
+        Returns: a list containing the cost of the best solution found followed by the solution
+        """
+        # Smallest residual used for reweighting, so that days fitted exactly don't get an infinite weight
+        smallest_residual = 1e-8 * max(1.0, float(np.abs(self.demand).mean(dtype=np.float64)))
+
+        weights = self.solve_weighted_least_squares(np.ones(len(self.days)))
+        best_solution = weights
+        best_cost = self.evaluate_cost(weights)
+
+        for i in range(iterations):
+            residuals = np.abs(self.estimates @ weights.astype(self.days.dtype) - self.demand)
+            new_weights = self.solve_weighted_least_squares(1 / np.maximum(residuals, smallest_residual, dtype=np.float64))
+
+            # IRLS is not guaranteed to decrease the cost every iteration, so keep the best iterate
+            cost = self.evaluate_cost(new_weights)
+            if cost < best_cost:
+                best_solution = new_weights
+                best_cost = cost
+
+            converged = np.abs(new_weights - weights).max() <= tolerance * max(1.0, np.abs(weights).max())
+            weights = new_weights
+            if converged:
+                break
+
+        return [best_cost, best_solution.tolist()]
+
+    def solve_weighted_least_squares(self, day_weights):
+        """
+        Return the weights minimising the sum over the days of day_weights times the squared estimation error.
+
+        Solves the normal equations, (E^T W E) x = E^T W d, whose matrices are accumulated over blocks of days so that the
+        cost is one pass over the data and memory stays within EVALUATION_BLOCK_ELEMENTS. If the normal equations are too
+        ill-conditioned to solve accurately (beyond NORMAL_EQUATIONS_CONDITION_LIMIT, e.g. with a measurement that is
+        always zero), the weighted problem is solved with lstsq instead.
+
+        Parameters:
+        day_weights: a NumPy array containing one non-negative weight per day
+
+        Returns: a NumPy array containing the solution
+        """
+        normal_matrix = np.zeros((self.weight_count, self.weight_count))
+        normal_vector = np.zeros(self.weight_count)
+        block = max(1, self.EVALUATION_BLOCK_ELEMENTS // self.weight_count)
+
+        for start in range(0, len(self.days), block):
+            estimates = np.asarray(self.estimates[start:start + block], dtype=np.float64)
+            weighted_estimates = estimates * day_weights[start:start + block, None]
+            normal_matrix += estimates.T @ weighted_estimates
+            normal_vector += weighted_estimates.T @ self.demand[start:start + block]
+
+        if np.linalg.cond(normal_matrix) <= self.NORMAL_EQUATIONS_CONDITION_LIMIT:
+            return np.linalg.solve(normal_matrix, normal_vector)
+
+        scale = np.sqrt(day_weights)
+        return np.linalg.lstsq(self.estimates * scale[:, None], self.demand * scale, rcond=None)[0]
+
+    def iterative_neighbourhood_search(self, solution, iterations, monitor = None, operator = 'neighbourhood'):
         """
         Conduct an iterative neighbourhood search on a given solution to find lower-cost solutions.
 
@@ -161,35 +625,276 @@ class Pallets:
         and its neighbourhood. Repeats for the specified number of iterations, using the best solution as the new starting
         point each iteration.
 
+        Each neighbour differs from the current best in a single weight, so rather than re-scoring neighbours from scratch
+        the search keeps the per-day residuals of the current best and adjusts them by the change in that weight.
+
         Parameters:
-        solution: a set of 13 weights representing a solution to the pallet problem
+        solution: a set of weight_count weights representing a solution to the pallet problem
         iterations: number of iterations to search for
+        monitor (optional): a Search_Monitor to record phase times and the convergence trace in. Default None
+        operator (optional): 'neighbourhood', or 'subgradient' to run subgradient_search instead. Default 'neighbourhood'
 
         Returns: the best solution found
         """
-        best = solution
-        best_cost = self.evaluate_cost(solution)
+        self.check_local_search_operator(operator)
+        if operator == 'subgradient':
+            return self.subgradient_search(solution, iterations, monitor)
+
+        if monitor is not None:
+            monitor.start(self)
+        best = np.array(solution, dtype=np.float64)
+        residuals = self.residuals(best)
+        best_cost = np.abs(residuals).mean(dtype=np.float64)
         #print(f"Initial solution {best} costing {best_cost}")
 
         for i in range(iterations):
-            neighbourhood = self.find_neighbourhood(best)
-            best_neighbour = min(neighbourhood, key = lambda n : self.evaluate_cost(n))
-            best_neighbour_cost = self.evaluate_cost(best_neighbour)
+            # Perturb the value at each index by the same distribution used by find_neighbourhood
+            deltas = self.rng.normal(0.0, 2.0, len(best))
+            if monitor is not None:
+                monitor.lap("neighbourhood")
+            neighbour_costs = self.evaluate_neighbour_costs(residuals, deltas)
+            best_index = np.argmin(neighbour_costs)
+            best_neighbour_cost = neighbour_costs[best_index]
 
-            #print(f"Best neighbour: {best_neighbour} costing: {best_neighbour_cost}")
+            #print(f"Best neighbour: {best_index} costing: {best_neighbour_cost}")
 
             if best_neighbour_cost < best_cost:
-                best = best_neighbour
+                best[best_index] += deltas[best_index]
+                residuals += deltas[best_index] * self.estimates[:, best_index]
                 best_cost = best_neighbour_cost
 
+            if monitor is not None:
+                monitor.lap("evaluation")
+                monitor.iteration(best_cost, best)
+
+        if monitor is not None:
+            monitor.finish()
+
         #print(f"Best found in {iterations} iterations: {best} Costing: {best_cost}")
-        return best
+        return best.tolist()
+
+    def subgradient_search(self, solution, iterations, monitor = None):
+        """
+        Conduct an iterative local search on a given solution, stepping against the subgradient of the cost.
+
+        The cost is the mean absolute residual, so its subgradient is found from the signs of the current best's residuals
+        without any further evaluation (see subgradient_directions). Each iteration scores a single step against it,
+        rather than the weight_count neighbours of iterative_neighbourhood_search, and keeps the step if it lowers the cost. The
+        step length grows after a successful step and shrinks after a failed one.
+
+        Parameters:
+        solution: a set of weight_count weights representing a solution to the pallet problem
+        iterations: number of iterations (one evaluation each) to search for
+        monitor (optional): a Search_Monitor to record phase times and the convergence trace in. Default None
+
+        Returns: the best solution found
+        """
+        if monitor is not None:
+            monitor.start(self)
+        best = np.array(solution, dtype=np.float64)
+        residuals = self.residuals(best)
+        best_cost = np.abs(residuals).mean(dtype=np.float64)
+        step = self.SUBGRADIENT_STEP
+
+        for i in range(iterations):
+            candidate = best - step * self.subgradient_directions(residuals)
+            if monitor is not None:
+                monitor.lap("subgradient")
+            candidate_residuals = self.residuals(candidate)
+            candidate_cost = np.abs(candidate_residuals).mean(dtype=np.float64)
+
+            if candidate_cost < best_cost:
+                best = candidate
+                residuals = candidate_residuals
+                best_cost = candidate_cost
+                step *= self.SUBGRADIENT_STEP_GROWTH
+            else:
+                step *= self.SUBGRADIENT_STEP_SHRINK
+
+            if monitor is not None:
+                monitor.lap("evaluation")
+                monitor.iteration(best_cost, best)
+
+        if monitor is not None:
+            monitor.finish()
+
+        return best.tolist()
+
+    def subgradient_directions(self, residuals):
+        """
+        Return the unit-length subgradients of the cost for one or more solutions, given their residuals.
+
+        Each day contributes its measurements times the sign of its residual, so the subgradient points in the direction
+        of steepest increase in cost (away from a kink, where it is only a subgradient). Solutions with a zero subgradient
+        get a zero direction.
+
+        Parameters:
+        residuals: the per-day residuals of a solution, as returned by residuals(), or a (days x N) matrix with one column
+        per solution
+
+        Returns: a NumPy array containing the weight_count components of the direction, or a (weight_count x N) matrix of directions
+        """
+        subgradients = self.estimates.T @ np.sign(residuals)
+        norms = np.linalg.norm(subgradients, axis=0)
+
+        return subgradients / np.where(norms > 0, norms, 1.0)
+
+    def check_local_search_operator(self, operator):
+        """
+        Raise a ValueError if operator is not one of LOCAL_SEARCH_OPERATORS.
+        """
+        if operator not in self.LOCAL_SEARCH_OPERATORS:
+            raise ValueError(f"Unknown local search operator {operator!r}, expected one of {self.LOCAL_SEARCH_OPERATORS}")
+
+    def batch_neighbourhood_search(self, solutions, iterations, workers = 1, operator = 'neighbourhood'):
+        """
+        Conduct an iterative neighbourhood search on many solutions at once.
+
+        Equivalent to running iterative_neighbourhood_search on each row of solutions, but the residuals of all the
+        current best solutions are held in one (days x N) matrix so that every iteration scores the neighbourhoods of
+        all N solutions together. On large datasets the solutions are searched a block at a time, so that the matrix
+        stays within EVALUATION_BLOCK_ELEMENTS. The solutions can also be split between a pool of worker processes,
+        which load the days from the problem's source file themselves (mapping its binary cache, if it has one) and are
+        sent only the days appended since. If appended days have been reordered, the workers are sent every day.
+
+        Parameters:
+        solutions: a (N x weight_count) array, or a list of N lists of weight_count floats, of starting solutions
+        iterations: number of iterations to search for
+        workers (optional): number of worker processes to split the solutions between, or None for one per CPU. Default 1
+        operator (optional): 'neighbourhood', or 'subgradient' to run subgradient_search on each row instead. Default 'neighbourhood'
+
+        Returns: a list containing a (N x weight_count) array of the best solution found from each start, followed by an array of their costs
+        """
+        self.check_local_search_operator(operator)
+        best = np.array(solutions, dtype=np.float64)
+
+        if workers is None:
+            workers = os.cpu_count()
+
+        if workers > 1 and len(best) > 1:
+            chunks = np.array_split(best, min(workers, len(best)))
+            seeds = self.rng.integers(2**32, size=len(chunks)).tolist()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                appended = self.source_day_count is not None
+                days = self.days[self.source_day_count:] if appended else self.days
+                results = list(executor.map(neighbourhood_search_chunk, [self.source] * len(chunks), [days] * len(chunks), [appended] * len(chunks),
+                                            chunks, [iterations] * len(chunks), seeds, [operator] * len(chunks)))
+
+            for result in results:
+                self.evaluations += result[2]
+            return [np.concatenate([result[0] for result in results]), np.concatenate([result[1] for result in results])]
+
+        search = self.batch_subgradient_search if operator == 'subgradient' else self.neighbourhood_search_block
+        block = max(1, self.EVALUATION_BLOCK_ELEMENTS // max(1, len(self.days)))
+        best_costs = np.empty(len(best))
+        for start in range(0, len(best), block):
+            best_costs[start:start + block] = search(best[start:start + block], iterations)[1]
+
+        return [best, best_costs]
+
+    def neighbourhood_search_block(self, best, iterations):
+        """
+        Run iterative_neighbourhood_search on a block of solutions at once, for batch_neighbourhood_search.
+
+        Parameters:
+        best: a (N x weight_count) array of starting solutions, updated in place
+        iterations: number of iterations to search for
+
+        Returns: a list containing the (N x weight_count) array of the best solution found from each start, followed by an array of their costs
+        """
+        residuals = self.estimates @ best.T.astype(self.days.dtype) - self.demand[:, None]
+        best_costs = np.abs(residuals).mean(axis=0, dtype=np.float64)
+        self.evaluations += len(best)
+        solution_indices = np.arange(len(best))
+        # Working space for the residuals of one neighbour of every solution, and the costs of every neighbour
+        neighbour_residuals = np.empty_like(residuals)
+        neighbour_costs = np.empty(best.shape)
+
+        for i in range(iterations):
+            deltas = self.rng.normal(0.0, 2.0, best.shape)
+            for j in range(best.shape[1]):
+                np.multiply(self.estimates[:, j, None], deltas[:, j], out=neighbour_residuals)
+                neighbour_residuals += residuals
+                np.abs(neighbour_residuals, out=neighbour_residuals)
+                neighbour_costs[:, j] = neighbour_residuals.mean(axis=0, dtype=np.float64)
+            self.evaluations += deltas.size
+
+            best_indices = np.argmin(neighbour_costs, axis=1)
+            best_neighbour_costs = neighbour_costs[solution_indices, best_indices]
+
+            improved = np.nonzero(best_neighbour_costs < best_costs)[0]
+            improved_indices = best_indices[improved]
+            improved_deltas = deltas[improved, improved_indices]
+            best[improved, improved_indices] += improved_deltas
+            residuals[:, improved] += self.estimates[:, improved_indices] * improved_deltas
+            best_costs[improved] = best_neighbour_costs[improved]
+
+        return [best, best_costs]
+
+    def batch_subgradient_search(self, best, iterations):
+        """
+        Run subgradient_search on a block of solutions at once, for batch_neighbourhood_search.
+
+        Parameters:
+        best: a (N x weight_count) array of starting solutions, updated in place
+        iterations: number of iterations to search for
+
+        Returns: a list containing the (N x weight_count) array of the best solution found from each start, followed by an array of their costs
+        """
+        residuals = self.estimates @ best.T.astype(self.days.dtype) - self.demand[:, None]
+        best_costs = np.abs(residuals).mean(axis=0, dtype=np.float64)
+        self.evaluations += len(best)
+        steps = np.full(len(best), self.SUBGRADIENT_STEP, dtype=np.float64)
+
+        for i in range(iterations):
+            candidates = best - (self.subgradient_directions(residuals) * steps).T
+            candidate_residuals = self.estimates @ candidates.T.astype(self.days.dtype) - self.demand[:, None]
+            candidate_costs = np.abs(candidate_residuals).mean(axis=0, dtype=np.float64)
+            self.evaluations += len(best)
+
+            improved = candidate_costs < best_costs
+            best[improved] = candidates[improved]
+            residuals[:, improved] = candidate_residuals[:, improved]
+            best_costs[improved] = candidate_costs[improved]
+            steps *= np.where(improved, self.SUBGRADIENT_STEP_GROWTH, self.SUBGRADIENT_STEP_SHRINK)
+
+        return [best, best_costs]
+
+    def residuals(self, weights):
+        """
+        Return the signed estimation error for every day when combining the day's estimates with a set of weight_count weights.
+
+        Counts as one evaluation.
+
+        Parameters:
+        weights: a list containing weight_count floats to be combined with the day's demand estimates
+
+        Returns: a NumPy array containing one residual (estimate minus known demand) per day
+        """
+        self.evaluations += 1
+        return self.estimates @ np.asarray(weights, dtype=self.days.dtype) - self.demand
+
+    def evaluate_neighbour_costs(self, residuals, deltas):
+        """
+        Evaluate the neighbours of a solution that each differ from it in a single weight.
+
+        Neighbour i is the solution with deltas[i] added to weight i. Its cost is found by adjusting the solution's
+        residuals by deltas[i] times the day's measurement i, which costs O(days) per neighbour rather than O(days x weight_count).
+
+        Parameters:
+        residuals: the per-day residuals of the solution, as returned by residuals()
+        deltas: the change made to each weight, one neighbour per entry
+
+        Returns: a NumPy array containing the average error of each neighbour
+        """
+        self.evaluations += len(deltas)
+        return np.abs(residuals[:, None] + self.estimates * deltas).mean(axis=0, dtype=np.float64)
 
 
     def find_neighbourhood(self, solution):
         """
         Given a solution, find thirteen neighbours by copying the original solution
-        and perturbing the value at index i, for 0 <= i < 13.
+        and perturbing the value at index i, for 0 <= i < weight_count.
         """
         neighbours = []
 
@@ -199,4 +904,40 @@ class Pallets:
             neighbour[i] = random.normalvariate(solution[i], 2.0)
             neighbours.append(neighbour)
 
-        return neighbours
\ No newline at end of file
+        return neighbours
+
+def worker_problem(source, days, appended = True):
+    """
+    Return a pallet problem for a worker process, with its own random number generator and evaluation counters.
+
+    Parameters:
+    source: the file name, dtype name and cache setting the problem was loaded with, as recorded in Pallets.source
+    days: the days appended to those loaded from source, or every day of the problem if appended is False
+    appended (optional): whether days are added to the days loaded from source, rather than replacing them. Default True
+    """
+    file_name, dtype, cache = source
+    key = (file_name, dtype, cache)
+    if key not in _worker_problems:
+        _worker_problems[key] = Pallets(file_name, np.dtype(dtype), cache)
+
+    pallet_problem = _worker_problems[key].share()
+    if not appended:
+        pallet_problem.days = days
+        pallet_problem.source_day_count = None
+        pallet_problem.set_views()
+    elif len(days) > 0:
+        pallet_problem.append_days(days)
+
+    return pallet_problem
+
+def neighbourhood_search_chunk(source, days, appended, solutions, iterations, seed, operator = 'neighbourhood'):
+    """
+    Run a batch neighbourhood search on one worker's share of the solutions, against the problem rebuilt by worker_problem.
+
+    Returns: a list containing the best solutions and their costs, followed by the number of evaluations performed
+    """
+    pallet_problem = worker_problem(source, days, appended)
+    pallet_problem.seed(seed)
+    best, best_costs = pallet_problem.batch_neighbourhood_search(solutions, iterations, operator=operator)
+
+    return [best, best_costs, pallet_problem.evaluations]
@@ -1,77 +1,115 @@
 from Pallets import Pallets
-import random
+import numpy as np
 
 class Particle:
     """
     Represents a single particle in the PSO algorithm.
+
+    The position, velocity and pbest are NumPy arrays that are updated in place, and the particle holds only the slots
+    below, so that moving a particle builds no new lists or vectors. The coefficients of the update rule belong to the swarm.
     """
 
     INERTIAL_COEFFICIENT = 0.721
     COGNITIVE_COEFFICIENT = 1.1193
     SOCIAL_COEFFICIENT = 1.1193
 
-    def __init__(self, pallet_problem : Pallets, initial_solution):
+    __slots__ = ['pallet_problem', 'coefficients', 'position', 'velocity', 'pbest', 'pbest_cost', 'scratch']
+
+    def __init__(self, pallet_problem : Pallets, initial_solution, coefficients = None):
         """
         Initialise the particle with its initial position and velocity, and an instance of the pallet problem (used
         to generate and evaluate solutions).
-        """
-        self.pallet_problem = pallet_problem
-        self.position = initial_solution
-        self.pbest = self.position
-        self.pbest_cost = self.pallet_problem.evaluate_cost(self.pbest)
-
-        self.velocity = [None for x in range(len(self.position))]
-        random_position = self.pallet_problem.generate_random_solution(-2, 2)
 
+        Parameters:
+        pallet_problem: the instance of the pallet problem
+        initial_solution: the particle's start position
+        coefficients (optional): the [inertial, cognitive, social] coefficients, shared by the particles of a swarm.
+        Default None (the class defaults)
+        """
+        position = np.array(initial_solution, dtype=np.float64)
+        pbest_cost = pallet_problem.evaluate_cost(position)
         # Set initial velocity to half the difference between a random position and the initial position
-        for i in range(len(random_position)):
-            self.velocity[i] = (random_position[i] - self.position[i]) / 2
+        random_position = np.array(pallet_problem.generate_random_solution(-2, 2))
 
+        self.initialise(pallet_problem, position, (random_position - position) / 2, position.copy(), pbest_cost, coefficients)
 
-    def calculate_new_velocity(self, gbest):
+    def initialise(self, pallet_problem : Pallets, position, velocity, pbest, pbest_cost, coefficients):
+        """
+        Set every slot of a new particle.
+        """
+        self.pallet_problem = pallet_problem
+        if coefficients is None:
+            coefficients = [self.INERTIAL_COEFFICIENT, self.COGNITIVE_COEFFICIENT, self.SOCIAL_COEFFICIENT]
+        # Held as a column so that the cognitive and social coefficients scale their rows of random numbers in one step
+        self.coefficients = np.asarray(coefficients, dtype=np.float64).reshape(3, 1)
+        self.position = position
+        self.velocity = velocity
+        self.pbest = pbest
+        self.pbest_cost = pbest_cost
+        # Working space for the velocity update: cognitive and social rows of random numbers, then of differences
+        self.scratch = np.empty((4, len(position)))
+
+    def update_velocity(self, gbest):
         """
-        Calculate the new velocity vector for the particle.
+        Update the particle's velocity, in place.
 
         Parameters:
-        gbest: the global best position found by the swarm
+        gbest: the global best position found by the swarm, as a NumPy array
+        """
+        random = self.scratch[:2]
+        differences = self.scratch[2:]
+
+        self.pallet_problem.rng.random(out=random)
+        random *= self.coefficients[1:]
+        np.subtract(self.pbest, self.position, out=differences[0])
+        np.subtract(gbest, self.position, out=differences[1])
+        differences *= random
 
-        Returns: the new velocity vector
+        self.velocity *= self.coefficients[0, 0]
+        self.velocity += differences[0]
+        self.velocity += differences[1]
+
+    def move(self, gbest):
         """
-        new_velocity = [None for x in range(len(gbest))]
-        
-        for i in range(len(self.velocity)):
-            new_velocity[i] = (self.INERTIAL_COEFFICIENT * self.velocity[i]) + self.COGNITIVE_COEFFICIENT * random.random() * (self.pbest[i] - self.position[i]) + self.SOCIAL_COEFFICIENT * random.random() * (gbest[i] - self.position[i])
-            
-        return new_velocity
-
-    def calculate_new_position(self):
+        Update the particle's velocity and then its position, in place.
+
+        Parameters:
+        gbest: the global best position found by the swarm, as a NumPy array
         """
-        Use the particle's velocity to calculate its new position.
+        self.update_velocity(gbest)
+        self.position += self.velocity
 
-        Returns: the new position
+    def accept(self, cost):
         """
-        new_position = [None for x in range(len(self.position))]
+        Update pbest if the particle's current position, with the given cost, is better.
 
-        for i in range(len(self.position)):
-            new_position[i] = self.position[i] + self.velocity[i]
+        Returns: True if pbest was updated
+        """
+        if cost < self.pbest_cost:
+            self.pbest[:] = self.position
+            self.pbest_cost = cost
+            return True
 
-        return new_position
+        return False
 
-    def update_particle(self, gbest):
+    def update_particle(self, gbest, monitor = None):
         """
         Update the particle's velocity and position and, if the new position is better, update pbest.
 
         Parameters:
-        gbest: the global best position found by the swarm
+        gbest: the global best position found by the swarm, as a NumPy array
+        monitor (optional): a Search_Monitor to record the time spent in each phase of the update. Default None
 
-        Returns: the new position of the particle
+        Returns: True if pbest was updated
         """
-        self.velocity = self.calculate_new_velocity(gbest)
-        self.position = self.calculate_new_position()
-        new_cost = self.pallet_problem.evaluate_cost(self.position)
-
-        if new_cost < self.pbest_cost:
-            self.pbest = self.position
-            self.pbest_cost = new_cost
-
-        return self.position
+        self.update_velocity(gbest)
+        if monitor is not None:
+            monitor.lap("velocity")
+        self.position += self.velocity
+        if monitor is not None:
+            monitor.lap("position")
+        improved = self.accept(self.pallet_problem.evaluate_cost(self.position, self.pbest_cost))
+        if monitor is not None:
+            monitor.lap("evaluation")
+
+        return improved
@@ -0,0 +1,161 @@
+import json
+import math
+import os
+
+import numpy as np
+
+class Result_Store:
+    """
+    A compact, append-only store of experiment results.
+
+    Each named result set (e.g. one run_test configuration) is kept as two files in the store's directory: a binary file
+    of fixed-size records, one per run, holding the run's cost followed by its solution as float64 values, and a JSON
+    file holding the configuration and running summary statistics. Runs are written and flushed to disk as they finish,
+    so a sweep that dies part-way keeps every completed run. The binary file can be memory-mapped for analysis.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Parameters:
+        directory: the directory holding the store's files, created if it doesn't exist
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.files = {}
+        self.summaries = {}
+
+    def record_type(self, features: int):
+        """
+        Return the NumPy type of one stored run with the given number of solution weights.
+        """
+        return np.dtype([('Cost', '<f8'), ('Solution', '<f8', (features,))])
+
+    def data_file_name(self, name: str):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def summary_file_name(self, name: str):
+        return os.path.join(self.directory, f"{name}.json")
+
+    def names(self):
+        """
+        Return the names of the result sets in the store.
+        """
+        return sorted(file_name[:-len(".json")] for file_name in os.listdir(self.directory) if file_name.endswith(".json"))
+
+    def append(self, name: str, cost, solution, configuration = None):
+        """
+        Append one run to a result set, creating the set if necessary, and update its summary statistics.
+
+        Parameters:
+        name: the name of the result set
+        cost: the cost of the run's best solution
+        solution: the run's best solution
+        configuration (optional): a dictionary describing the experiment, stored when the set is created. Default None
+        """
+        if name not in self.files:
+            self.open(name, len(solution), configuration)
+
+        record = np.zeros(1, dtype=self.record_type(len(solution)))
+        record['Cost'] = cost
+        record['Solution'] = solution
+
+        data_file = self.files[name]
+        data_file.write(record.tobytes())
+        data_file.flush()
+        os.fsync(data_file.fileno())
+
+        self.update_summary(self.summaries[name], cost)
+        self.write_summary(name)
+
+    def open(self, name: str, features: int, configuration = None):
+        """
+        Open a result set for appending, recovering its summary from the stored runs if the summary is missing or out of date.
+        """
+        summary = self.read_summary(name)
+        if summary is None:
+            summary = {'Configuration': configuration, 'Features': features, 'Count': 0, 'Mean': 0.0, 'M2': 0.0, 'Min': math.inf}
+
+        record_size = self.record_type(summary['Features']).itemsize
+        data_file = open(self.data_file_name(name), 'ab')
+
+        # Drop any partly written run left by an interrupted write
+        complete_size = data_file.tell() // record_size * record_size
+        if data_file.tell() != complete_size:
+            data_file.truncate(complete_size)
+            data_file.seek(complete_size)
+
+        if summary['Count'] != complete_size // record_size:
+            summary.update({'Count': 0, 'Mean': 0.0, 'M2': 0.0, 'Min': math.inf})
+            for cost in np.fromfile(self.data_file_name(name), dtype=self.record_type(summary['Features']))['Cost']:
+                self.update_summary(summary, float(cost))
+
+        self.files[name] = data_file
+        self.summaries[name] = summary
+        self.write_summary(name)
+
+    def close(self):
+        """
+        Close every result set opened for appending.
+        """
+        for data_file in self.files.values():
+            data_file.close()
+        self.files = {}
+        self.summaries = {}
+
+    def update_summary(self, summary: dict, cost):
+        """
+        Add one cost to a summary using Welford's online algorithm for the mean and variance.
+        """
+        summary['Count'] += 1
+        difference = cost - summary['Mean']
+        summary['Mean'] += difference / summary['Count']
+        summary['M2'] += difference * (cost - summary['Mean'])
+        summary['Min'] = min(summary['Min'], cost)
+
+    def read_summary(self, name: str):
+        """
+        Return the stored summary dictionary of a result set, or None if it has none.
+        """
+        if not os.path.exists(self.summary_file_name(name)):
+            return None
+
+        with open(self.summary_file_name(name), mode='r') as summary_file:
+            return json.load(summary_file)
+
+    def write_summary(self, name: str):
+        temporary_name = f"{self.summary_file_name(name)}.tmp"
+        with open(temporary_name, mode='w') as summary_file:
+            json.dump(self.summaries[name], summary_file)
+        os.replace(temporary_name, self.summary_file_name(name))
+
+    def summary(self, name: str):
+        """
+        Return the summary statistics of a result set.
+
+        Returns: a dictionary containing the set's configuration and the number of runs, followed by the minimum, mean and
+        sample standard deviation of their costs
+        """
+        summary = self.summaries.get(name) or self.read_summary(name)
+        count = summary['Count']
+        stdev = math.sqrt(summary['M2'] / (count - 1)) if count > 1 else math.nan
+
+        return {'Configuration': summary['Configuration'], 'Runs': count, 'Min': summary['Min'], 'Mean': summary['Mean'], 'Standard Deviation': stdev}
+
+    def runs(self, name: str):
+        """
+        Return the stored runs of a result set as a read-only memory-mapped array of records, with 'Cost' and 'Solution' fields.
+        """
+        features = (self.summaries.get(name) or self.read_summary(name))['Features']
+        record_type = self.record_type(features)
+        complete_size = os.path.getsize(self.data_file_name(name)) // record_type.itemsize
+
+        if complete_size == 0:
+            return np.zeros(0, dtype=record_type)
+
+        return np.memmap(self.data_file_name(name), dtype=record_type, mode='r', shape=(complete_size,))
+
+    def costs(self, name: str):
+        return self.runs(name)['Cost']
+
+    def solutions(self, name: str):
+        return self.runs(name)['Solution']
@@ -0,0 +1,123 @@
+import time
+
+class Search_Monitor:
+    """
+    Opt-in instrumentation for a search: per-phase timers, throughput, a convergence trace of the best cost found and
+    per-iteration callbacks.
+
+    Pass an instance as the monitor parameter of a Swarm or Pallets search. Searches only touch the monitor when one
+    is given, so leaving it out costs a single None check per step.
+    """
+
+    def __init__(self, target_cost = None, callbacks = None):
+        """
+        Parameters:
+        target_cost (optional): a cost whose first achievement is timed. Default None
+        callbacks (optional): a list of functions called after every iteration as callback(monitor, best_cost, best_solution). Default None
+        """
+        self.target_cost = target_cost
+        self.callbacks = list(callbacks) if callbacks is not None else []
+
+    def start(self, pallet_problem):
+        """
+        Reset the monitor at the start of a search.
+
+        Parameters:
+        pallet_problem: the instance of the pallet problem being searched, whose evaluation counter is read
+        """
+        self.pallet_problem = pallet_problem
+        self.start_evaluations = pallet_problem.evaluations
+        self.phase_times = {}
+        self.iterations = 0
+        self.best_cost = float("inf")
+        # List of (seconds since start, evaluations since start, best cost) entries, one per improvement
+        self.trace = []
+        self.target_time = None
+        self.start_time = time.perf_counter()
+        self.lap_time = self.start_time
+        self.end_time = None
+
+    def lap(self, phase: str):
+        """
+        Add the time since the previous lap (or the start of the search) to the total for a phase.
+        """
+        now = time.perf_counter()
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + now - self.lap_time
+        self.lap_time = now
+
+    def iteration(self, best_cost, best_solution = None):
+        """
+        Record the end of an iteration of the search, with the best cost found so far, and run the callbacks.
+        """
+        self.iterations += 1
+        self.record_best(best_cost)
+
+        for callback in self.callbacks:
+            callback(self, best_cost, best_solution)
+
+    def record_best(self, best_cost):
+        """
+        Record the best cost found so far without counting an iteration, e.g. once a search's initialisation has scored
+        its start positions, so that a search stopped before its first iteration still reports its best cost.
+        """
+        if best_cost < self.best_cost:
+            self.best_cost = float(best_cost)
+            elapsed = time.perf_counter() - self.start_time
+            self.trace.append((elapsed, self.evaluations(), self.best_cost))
+
+            if self.target_time is None and self.target_cost is not None and best_cost <= self.target_cost:
+                self.target_time = elapsed
+
+    def finish(self):
+        """
+        Record the end of the search.
+        """
+        self.end_time = time.perf_counter()
+
+    def elapsed(self):
+        """
+        Return the number of seconds the search has run for.
+        """
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return end_time - self.start_time
+
+    def evaluations(self):
+        """
+        Return the number of cost evaluations performed since the start of the search.
+        """
+        return self.pallet_problem.evaluations - self.start_evaluations
+
+    def evaluations_per_second(self):
+        return self.evaluations() / self.elapsed()
+
+    def iterations_per_second(self):
+        return self.iterations / self.elapsed()
+
+    def time_to_target(self, target_cost = None):
+        """
+        Return the number of seconds taken to first reach a cost at or below target_cost (by default the monitor's
+        target_cost), or None if it was never reached.
+        """
+        if target_cost is None:
+            return self.target_time
+
+        for elapsed, evaluations, cost in self.trace:
+            if cost <= target_cost:
+                return elapsed
+
+        return None
+
+    def summary(self):
+        """
+        Return a dictionary summarising the search.
+        """
+        return {
+            'Run Time': self.elapsed(),
+            'Iterations': self.iterations,
+            'Evaluations': self.evaluations(),
+            'Evaluations Per Second': self.evaluations_per_second(),
+            'Iterations Per Second': self.iterations_per_second(),
+            'Best Cost': self.best_cost,
+            'Time To Target': self.target_time,
+            'Phase Times': dict(self.phase_times),
+        }
@@ -0,0 +1,108 @@
+import math
+import time
+
+class Stopping_Criteria:
+    """
+    Decides when a search should stop, and records why.
+
+    Every search stops on its run time and evaluation budget. A Stopping_Criteria can add convergence criteria: no
+    improvement in the best cost within a number of evaluations, swarm diversity collapsing below a threshold, or
+    reaching a target cost. Swarm searches can be asked to restart their particles, rather than stop, when they stagnate
+    or lose diversity.
+    """
+
+    # Reasons a search can stop for
+    TARGET = 'target'
+    EVALUATIONS = 'evaluations'
+    TIME = 'time'
+    STAGNATION = 'stagnation'
+    DIVERSITY = 'diversity'
+
+    # Reasons a swarm search can restart its particles for, rather than stopping
+    RESTARTABLE = [STAGNATION, DIVERSITY]
+
+    def __init__(self, stall_evaluations = None, min_diversity = None, target_cost = None, restart = False):
+        """
+        Parameters:
+        stall_evaluations (optional): stop once this many evaluations have passed without the best cost improving. Default None
+        min_diversity (optional): stop once the mean distance of a swarm's particles from their centre falls below this. Default None
+        target_cost (optional): stop once the best cost is at or below this. Default None
+        restart (optional): whether swarm searches restart their particles, instead of stopping, on stagnation or lost diversity. Default False
+        """
+        self.stall_evaluations = stall_evaluations
+        self.min_diversity = min_diversity
+        self.target_cost = target_cost
+        self.restart = restart
+
+    def start(self, pallet_problem, run_time = None, max_evaluations = None):
+        """
+        Reset the criteria at the start of a search.
+
+        Parameters:
+        pallet_problem: the instance of the pallet problem being searched, whose evaluation counter is read
+        run_time (optional): length of time (seconds) to search for. Default None (no limit)
+        max_evaluations (optional): the maximum number of cost evaluations to perform. Default None (no limit)
+        """
+        self.pallet_problem = pallet_problem
+        self.end_time = time.time() + run_time if run_time is not None else None
+        self.max_evaluations = max_evaluations
+        self.start_evaluations = pallet_problem.evaluations
+        self.best_cost = math.inf
+        self.improvement_evaluations = 0
+        self.restarts = 0
+
+    def evaluations(self):
+        """
+        Return the number of cost evaluations performed since the start of the search.
+        """
+        return self.pallet_problem.evaluations - self.start_evaluations
+
+    def remaining_evaluations(self):
+        """
+        Return the number of cost evaluations left in the search's budget, or None if it has no evaluation limit.
+        """
+        if self.max_evaluations is None:
+            return None
+
+        return max(0, self.max_evaluations - self.evaluations())
+
+    def check(self, best_cost, diversity = None):
+        """
+        Check whether the search should stop.
+
+        Parameters:
+        best_cost: the cost of the best solution found so far
+        diversity (optional): the current diversity of the swarm, only needed when min_diversity is set. Default None
+
+        Returns: the reason the search should stop, or None if it should continue
+        """
+        evaluations = self.evaluations()
+        if best_cost < self.best_cost:
+            self.best_cost = best_cost
+            self.improvement_evaluations = evaluations
+
+        if self.target_cost is not None and best_cost <= self.target_cost:
+            return self.TARGET
+        if self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            return self.EVALUATIONS
+        if self.end_time is not None and time.time() >= self.end_time:
+            return self.TIME
+        if self.stall_evaluations is not None and evaluations - self.improvement_evaluations >= self.stall_evaluations:
+            return self.STAGNATION
+        if self.min_diversity is not None and diversity is not None and diversity < self.min_diversity:
+            return self.DIVERSITY
+
+        return None
+
+    def should_restart(self, reason):
+        """
+        Return True if a swarm search should restart its particles, rather than stop, for the given reason.
+        """
+        return self.restart and reason in self.RESTARTABLE
+
+    def restarted(self):
+        """
+        Record that the swarm's particles have been restarted, so that stagnation is measured from now.
+        """
+        self.restarts += 1
+        self.improvement_evaluations = self.evaluations()
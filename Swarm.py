@@ -1,74 +1,437 @@
-import time
+import contextlib
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 from Pallets import Pallets
 from Particle import Particle
 from Particle_With_LS import Particle_With_LS
+from Stopping_Criteria import Stopping_Criteria
 
 class Swarm:
     """
     Represents a particle swarm for an instance of the pallet problem.
     """
-    def __init__(self, pallet_problem : Pallets, cognitive_coefficient = 1.1193):        
+    def __init__(self, pallet_problem : Pallets, cognitive_coefficient = 1.1193, local_search_operator = 'neighbourhood',
+                 inertial_coefficient = Particle.INERTIAL_COEFFICIENT, social_coefficient = Particle.SOCIAL_COEFFICIENT):        
         self.pallet_problem = pallet_problem
-        Particle.COGNITIVE_COEFFICIENT = cognitive_coefficient
-        Particle_With_LS.COGNITIVE_COEFFICIENT = cognitive_coefficient
+        # Operator used by the local searches initialising PSOwLSI pbests, see Pallets.LOCAL_SEARCH_OPERATORS
+        self.local_search_operator = local_search_operator
+        # Coefficients of the update rule, belonging to this swarm alone so that differently configured swarms can coexist
+        self.inertial_coefficient = inertial_coefficient
+        self.cognitive_coefficient = cognitive_coefficient
+        self.social_coefficient = social_coefficient
+        # State of the array-backed swarm, kept between searches so that a search can resume
+        self.positions = None
 
-    def timed_swarm_search(self, swarm_size: int, run_time: int):
+    def timed_swarm_search(self, swarm_size: int, run_time: int, max_evaluations = None, initial_solution = None, monitor = None, stopping = None, threads = 1):
         """
         Conduct a PSO swarm search for a solution to the pallet problem for a specified length of time.
 
         Parameters:
         swarm_size: number of particles in the swarm
-        run_time: length of time (seconds) to search for
+        run_time: length of time (seconds) to search for, or None to stop on max_evaluations alone
+        max_evaluations (optional): the maximum number of cost evaluations to perform, checked once per iteration and used to cap the
+        start-up local searches (see local_search_iterations). Default None (no limit)
+        initial_solution (optional): a solution to use as the initial gbest, e.g. from Pallets.solve_least_absolute_deviations. Default None (random)
+        monitor (optional): a Search_Monitor to record phase times and the convergence trace in. Default None
+        stopping (optional): a Stopping_Criteria adding convergence criteria and restarts. Default None
+        threads (optional): number of threads to score the particles with each iteration, see particle_swarm_search. Default 1
+
+        Returns: a list containing the best solution found, followed by its cost, the number of evaluations performed and
+        the reason the search stopped
+        """
+        return self.particle_swarm_search(swarm_size, run_time, max_evaluations, initial_solution, monitor, stopping, threads=threads)
+
+    def timed_swarm_search_with_lsi(self, swarm_size: int, run_time: int, max_evaluations = None, initial_solution = None, workers = 1, monitor = None, stopping = None, threads = 1):
+        """
+        Conduct a PSOwLSI swarm search for a solution to the pallet problem for a specified length of time.
+
+        The local searches that initialise each particle's pbest are run as one batch across the whole swarm.
+
+        Parameters:
+        swarm_size: number of particles in the swarm
+        run_time: length of time (seconds) to search for, or None to stop on max_evaluations alone
+        max_evaluations (optional): the maximum number of cost evaluations to perform, checked once per iteration and used to cap the
+        start-up local searches (see local_search_iterations). Default None (no limit)
+        initial_solution (optional): a solution to use as the initial gbest, e.g. from Pallets.solve_least_absolute_deviations. Default None (random)
+        workers (optional): number of worker processes to split the initial local searches between, or None for one per CPU. Default 1
+        monitor (optional): a Search_Monitor to record phase times and the convergence trace in. Default None
+        stopping (optional): a Stopping_Criteria adding convergence criteria and restarts. Default None
+        threads (optional): number of threads to score the particles with each iteration, see particle_swarm_search. Default 1
+
+        Returns: a list containing the best solution found, followed by its cost, the number of evaluations performed and
+        the reason the search stopped
+        """
+        return self.particle_swarm_search(swarm_size, run_time, max_evaluations, initial_solution, monitor, stopping, True, workers, threads)
+
+    def particle_swarm_search(self, swarm_size: int, run_time: int, max_evaluations, initial_solution, monitor, stopping, LSI = False, workers = 1, threads = 1):
+        """
+        Conduct a PSO or PSOwLSI search with a list of Particle or Particle_With_LS objects. See timed_swarm_search
+        and timed_swarm_search_with_lsi.
 
-        Returns: a list containing the best solution found, followed by its cost
+        With threads > 1, each iteration moves every particle and then scores the new positions concurrently on a pool
+        of threads, which share the problem's days read only. gbest is then only updated once per iteration, rather
+        than after each particle.
         """
-        end_time = time.time() + run_time
-        gbest = self.pallet_problem.generate_random_solution()
+        criteria = stopping if stopping is not None else Stopping_Criteria()
+        criteria.start(self.pallet_problem, run_time, max_evaluations)
+        if monitor is not None:
+            monitor.start(self.pallet_problem)
+        gbest = np.array(self.initial_gbest(initial_solution), dtype=np.float64)
         gbest_cost = self.pallet_problem.evaluate_cost(gbest)
-        self.particles = [None for x in range(swarm_size)]
+        self.particles = self.create_particles(swarm_size, LSI, workers, self.local_search_iterations(swarm_size, criteria))
+        gbest, gbest_cost = self.best_pbest(gbest, gbest_cost)
+        if monitor is not None:
+            monitor.lap("initialisation")
+            monitor.record_best(gbest_cost)
+        # The pool is shut down however the search ends, including by an exception from a monitor callback
+        with ThreadPoolExecutor(max_workers=threads) if threads > 1 else contextlib.nullcontext() as executor:
+            while True:
+                diversity = self.diversity(np.array([particle.position for particle in self.particles])) if criteria.min_diversity is not None else None
+                reason = criteria.check(gbest_cost, diversity)
+                if reason is not None:
+                    if not criteria.should_restart(reason):
+                        break
+                    self.particles = self.create_particles(swarm_size, LSI, workers, self.local_search_iterations(swarm_size, criteria))
+                    gbest, gbest_cost = self.best_pbest(gbest, gbest_cost)
+                    criteria.restarted()
+                    if monitor is not None:
+                        monitor.lap("initialisation")
+                    continue
 
-        for i in range(swarm_size):
-                self.particles[i] = Particle(self.pallet_problem, self.pallet_problem.generate_random_solution())
+                if executor is not None:
+                    self.update_particles_threaded(executor, threads, gbest, monitor)
+                    gbest, gbest_cost = self.best_pbest(gbest, gbest_cost)
+                else:
+                    for particle in self.particles:
+                        particle.update_particle(gbest, monitor)
 
-        while time.time() < end_time:
-            for j in range(len(self.particles)):
-                pbest = self.particles[j].update_particle(gbest)
-                pbest_cost = self.pallet_problem.evaluate_cost(pbest)
+                        if particle.pbest_cost < gbest_cost:
+                            gbest = particle.pbest.copy()
+                            gbest_cost = particle.pbest_cost
 
-                if pbest_cost < gbest_cost:
-                    gbest = pbest
-                    gbest_cost = pbest_cost
+                        if monitor is not None:
+                            monitor.lap("gbest")
+
+                if monitor is not None:
+                    monitor.iteration(gbest_cost, gbest)
+
+        if monitor is not None:
+            monitor.finish()
 
         #print(f"Best found by swarm search: {self.gbest} costing {self.gbest_cost}")
+        return [gbest.tolist(), gbest_cost, criteria.evaluations(), reason]
+
+    def best_pbest(self, gbest, gbest_cost):
+        """
+        Return a list containing the best of gbest and the particles' pbests, followed by its cost.
+        """
+        best = min(self.particles, key=lambda particle: particle.pbest_cost)
+        if best.pbest_cost < gbest_cost:
+            return [best.pbest.copy(), best.pbest_cost]
+
         return [gbest, gbest_cost]
 
-    def timed_swarm_search_with_lsi(self, swarm_size: int, run_time: int):
+    def update_particles_threaded(self, executor, threads: int, gbest, monitor = None):
         """
-        Conduct a PSOwLSI swarm search for a solution to the pallet problem for a specified length of time.
+        Move every particle, score the new positions on a pool of threads, then update the pbests.
+
+        The particles are moved in this thread, so that the random numbers are drawn in the same order on every run, and
+        split into one share per thread for scoring with Pallets.cost_with_cutoff.
+
+        Parameters:
+        executor: the ThreadPoolExecutor to score the particles on
+        threads: number of threads in the pool
+        gbest: the global best position found by the swarm
+        monitor (optional): a Search_Monitor to record the time spent in each phase. Default None
+        """
+        for particle in self.particles:
+            particle.move(gbest)
+        if monitor is not None:
+            monitor.lap("position")
+
+        shares = [self.particles[i::threads] for i in range(threads)]
+        score = lambda share: [self.pallet_problem.cost_with_cutoff(particle.position, particle.pbest_cost) for particle in share]
+        share_costs = list(executor.map(score, shares))
+
+        for share, costs in zip(shares, share_costs):
+            self.pallet_problem.evaluations += len(costs)
+            self.pallet_problem.abandoned_evaluations += costs.count(math.inf)
+            for particle, cost in zip(share, costs):
+                particle.accept(cost)
+        if monitor is not None:
+            monitor.lap("evaluation")
+
+    def local_search_iterations(self, swarm_size: int, criteria: Stopping_Criteria):
+        """
+        Return the number of local search iterations to initialise PSOwLSI pbests with: LOCAL_SEARCH_ITERATIONS, or
+        fewer if that many would take the search past its evaluation budget.
+
+        The start positions are always scored, so a search whose remaining budget is smaller than swarm_size still
+        overruns it, by at most swarm_size evaluations (plus one for the initial gbest).
 
         Parameters:
         swarm_size: number of particles in the swarm
-        run_time: length of time (seconds) to search for
+        criteria: the Stopping_Criteria of the search, already started
+        """
+        remaining = criteria.remaining_evaluations()
+        if remaining is None:
+            return Particle_With_LS.LOCAL_SEARCH_ITERATIONS
 
-        Returns: a list containing the best solution found, followed by its cost
+        # Evaluations each iteration of the batch local search costs
+        iteration_evaluations = swarm_size * (1 if self.local_search_operator == 'subgradient' else self.pallet_problem.weight_count)
+
+        return int(min(Particle_With_LS.LOCAL_SEARCH_ITERATIONS, max(0, remaining - swarm_size) // iteration_evaluations))
+
+    def create_particles(self, swarm_size: int, LSI = False, workers = 1, local_search_iterations = Particle_With_LS.LOCAL_SEARCH_ITERATIONS):
         """
-        end_time = time.time() + run_time
-        gbest = self.pallet_problem.generate_random_solution()
-        gbest_cost = self.pallet_problem.evaluate_cost(gbest)
-        self.particles = [None for x in range(swarm_size)]
+        Return a list of particles at random start positions.
 
-        for i in range(swarm_size):
-                self.particles[i] = Particle_With_LS(self.pallet_problem, self.pallet_problem.generate_random_solution())
+        Parameters:
+        swarm_size: number of particles
+        LSI (optional): whether to create Particle_With_LS particles, whose local searches are run as one batch. Default False
+        workers (optional): number of worker processes to split the local searches between, or None for one per CPU. Default 1
+        local_search_iterations (optional): number of iterations of each local search. Default Particle_With_LS.LOCAL_SEARCH_ITERATIONS
+        """
+        # One coefficients array, shared by every particle
+        coefficients = np.array([[self.inertial_coefficient], [self.cognitive_coefficient], [self.social_coefficient]])
 
-        while time.time() < end_time:
-            for j in range(len(self.particles)):
-                pbest = self.particles[j].update_particle(gbest)
-                pbest_cost = self.pallet_problem.evaluate_cost(pbest)
+        if not LSI:
+            return [Particle(self.pallet_problem, self.pallet_problem.generate_random_solution(), coefficients) for x in range(swarm_size)]
 
-                if pbest_cost < gbest_cost:
-                    gbest = pbest
-                    gbest_cost = pbest_cost
+        initial_positions = self.pallet_problem.generate_random_solutions(swarm_size)
+        pbests, pbest_costs = self.pallet_problem.batch_neighbourhood_search(initial_positions, local_search_iterations, workers, self.local_search_operator)
 
-        #print(f"Best found by swarm search: {self.gbest} costing {self.gbest_cost}")
-        return [gbest, gbest_cost]
\ No newline at end of file
+        return [Particle_With_LS(self.pallet_problem, initial_positions[i], pbests[i], float(pbest_costs[i]), self.local_search_operator, coefficients) for i in range(swarm_size)]
+
+    def diversity(self, positions):
+        """
+        Return the mean distance of a set of particle positions from their centre.
+        """
+        return float(np.linalg.norm(positions - positions.mean(axis=0), axis=1).mean())
+
+    def timed_array_swarm_search(self, swarm_size: int, run_time: int, max_evaluations = None, initial_solution = None, LSI = False, monitor = None, stopping = None, resume = False):
+        """
+        Conduct a PSO swarm search for a specified length of time, holding the whole swarm in arrays.
+
+        Uses the same inertial, cognitive and social update rule as Particle, but positions, velocities and pbests
+        are stored as (swarm_size x weight_count) arrays so that each iteration is a handful of array operations and a single
+        batched evaluation. All particles move against the gbest from the start of the iteration. With LSI, pbests are
+        initialised as in PSOwLSI by a batch of local searches.
+
+        With resume, the search continues from the swarm left by the previous array search (or load_array_swarm) instead
+        of starting from random positions. If days have been appended to the problem since, the pbest and gbest costs are
+        first brought up to date by scoring only the new days.
+
+        Parameters:
+        swarm_size: number of particles in the swarm
+        run_time: length of time (seconds) to search for, or None to stop on max_evaluations alone
+        max_evaluations (optional): the maximum number of cost evaluations to perform, checked once per iteration and used to cap the
+        start-up local searches (see local_search_iterations). Default None (no limit)
+        initial_solution (optional): a solution to use as the initial gbest, e.g. from Pallets.solve_least_absolute_deviations. Default None (random)
+        LSI (optional): whether to initialise pbests with local searches, as in PSOwLSI. Default False
+        monitor (optional): a Search_Monitor to record phase times and the convergence trace in. Default None
+        stopping (optional): a Stopping_Criteria adding convergence criteria and restarts. Default None
+        resume (optional): whether to continue from the current swarm, if there is one, with initial_solution (if given)
+        added to it as a migrant. swarm_size is then ignored. Default False
+
+        Returns: a list containing the best solution found, followed by its cost, the number of evaluations performed and
+        the reason the search stopped
+        """
+        criteria = stopping if stopping is not None else Stopping_Criteria()
+        criteria.start(self.pallet_problem, run_time, max_evaluations)
+        if monitor is not None:
+            monitor.start(self.pallet_problem)
+
+        if resume and self.positions is not None:
+            swarm_size = len(self.positions)
+            self.update_array_swarm_costs()
+            if initial_solution is not None:
+                self.receive_migrant(initial_solution, self.pallet_problem.evaluate_cost(initial_solution))
+        else:
+            self.initialise_array_swarm(swarm_size, initial_solution, LSI, self.local_search_iterations(swarm_size, criteria))
+        if monitor is not None:
+            monitor.lap("initialisation")
+            monitor.record_best(self.gbest_cost)
+
+        while True:
+            diversity = self.diversity(self.positions) if criteria.min_diversity is not None else None
+            reason = criteria.check(self.gbest_cost, diversity)
+            if reason is not None:
+                if not criteria.should_restart(reason):
+                    break
+                self.initialise_array_particles(swarm_size, LSI, self.local_search_iterations(swarm_size, criteria))
+                self.update_gbest_from_pbests()
+                criteria.restarted()
+                if monitor is not None:
+                    monitor.lap("initialisation")
+                continue
+
+            self.step_array_swarm(monitor)
+            if monitor is not None:
+                monitor.iteration(self.gbest_cost, self.gbest)
+
+        if monitor is not None:
+            monitor.finish()
+
+        return [self.gbest.tolist(), float(self.gbest_cost), criteria.evaluations(), reason]
+
+    def initial_gbest(self, initial_solution = None):
+        """
+        Return the position a search starts with as its gbest: a copy of initial_solution if given, otherwise a
+        random solution.
+        """
+        if initial_solution is not None:
+            return list(initial_solution)
+
+        return self.pallet_problem.generate_random_solution()
+
+    def initialise_array_swarm(self, swarm_size: int, initial_solution = None, LSI = False, local_search_iterations = Particle_With_LS.LOCAL_SEARCH_ITERATIONS):
+        """
+        Initialise the array-backed swarm with random positions, and velocities set to half the difference between
+        a random position and the initial position.
+
+        With LSI, pbests are instead initialised by a local search on each start position, and velocities to half the
+        vector toward pbest, as in Particle_With_LS.
+
+        Parameters:
+        swarm_size: number of particles in the swarm
+        initial_solution (optional): a solution to use as the initial gbest. Default None (random)
+        LSI (optional): whether to initialise pbests with local searches. Default False
+        local_search_iterations (optional): number of iterations of each local search. Default Particle_With_LS.LOCAL_SEARCH_ITERATIONS
+        """
+        self.initialise_array_particles(swarm_size, LSI, local_search_iterations)
+
+        self.gbest = np.asarray(self.initial_gbest(initial_solution), dtype=np.float64)
+        self.gbest_cost = self.pallet_problem.evaluate_cost(self.gbest)
+        self.update_gbest_from_pbests()
+        self.day_count = len(self.pallet_problem.days)
+
+    def update_gbest_from_pbests(self):
+        """
+        Replace the array-backed swarm's gbest with its best pbest, if that is better, e.g. after the pbests have been
+        initialised by local searches.
+        """
+        best = np.argmin(self.pbest_costs)
+        if self.pbest_costs[best] < self.gbest_cost:
+            self.gbest = self.pbests[best].copy()
+            self.gbest_cost = float(self.pbest_costs[best])
+
+    def update_array_swarm_costs(self):
+        """
+        Bring the array-backed swarm's pbest and gbest costs up to date with the days currently held by the problem.
+
+        If days have only been appended since the costs were computed, only the new days are scored; otherwise every
+        pbest is re-evaluated.
+        """
+        day_count = len(self.pallet_problem.days)
+        if day_count == self.day_count:
+            return
+
+        if day_count > self.day_count:
+            self.pbest_costs = self.pallet_problem.update_costs(self.pbests, self.pbest_costs, self.day_count)
+            self.gbest_cost = float(self.pallet_problem.update_costs([self.gbest], [self.gbest_cost], self.day_count)[0])
+        else:
+            self.pbest_costs = self.pallet_problem.evaluate_costs(self.pbests)
+            self.gbest_cost = self.pallet_problem.evaluate_cost(self.gbest)
+
+        # The old gbest may no longer be the best of the pbests
+        self.update_gbest_from_pbests()
+
+        self.day_count = day_count
+
+    def save_array_swarm(self, file_name: str):
+        """
+        Save the state of the array-backed swarm to a .npz file, so that a later search can resume from it.
+        """
+        np.savez(file_name, positions=self.positions, velocities=self.velocities, pbests=self.pbests, pbest_costs=self.pbest_costs,
+                 gbest=self.gbest, gbest_cost=self.gbest_cost, day_count=self.day_count)
+
+    def load_array_swarm(self, file_name: str):
+        """
+        Load the state of the array-backed swarm saved by save_array_swarm. Follow with a search with resume=True.
+        """
+        with np.load(file_name) as state:
+            self.positions = state['positions']
+            self.velocities = state['velocities']
+            self.pbests = state['pbests']
+            self.pbest_costs = state['pbest_costs']
+            self.gbest = state['gbest']
+            self.gbest_cost = float(state['gbest_cost'])
+            self.day_count = int(state['day_count'])
+
+    def initialise_array_particles(self, swarm_size: int, LSI = False, local_search_iterations = Particle_With_LS.LOCAL_SEARCH_ITERATIONS):
+        """
+        Give every particle of the array-backed swarm a new random position, velocity and pbest, keeping gbest.
+
+        Parameters:
+        swarm_size: number of particles in the swarm
+        LSI (optional): whether to initialise pbests with local searches. Default False
+        local_search_iterations (optional): number of iterations of each local search. Default Particle_With_LS.LOCAL_SEARCH_ITERATIONS
+        """
+        self.positions = self.pallet_problem.generate_random_solutions(swarm_size)
+
+        if LSI:
+            self.pbests, self.pbest_costs = self.pallet_problem.batch_neighbourhood_search(self.positions, local_search_iterations, operator=self.local_search_operator)
+            self.velocities = (self.pbests - self.positions) / 2
+        else:
+            random_positions = self.pallet_problem.generate_random_solutions(swarm_size, -2, 2)
+            self.velocities = (random_positions - self.positions) / 2
+            self.pbests = self.positions.copy()
+            self.pbest_costs = self.pallet_problem.evaluate_costs(self.pbests)
+
+    def step_array_swarm(self, monitor = None):
+        """
+        Move every particle in the array-backed swarm once, then update the pbests and gbest.
+
+        Parameters:
+        monitor (optional): a Search_Monitor to record the time spent in each phase of the step. Default None
+        """
+        rng = self.pallet_problem.rng
+        cognitive_random = rng.random(self.positions.shape)
+        social_random = rng.random(self.positions.shape)
+
+        self.velocities *= self.inertial_coefficient
+        self.velocities += self.cognitive_coefficient * cognitive_random * (self.pbests - self.positions)
+        self.velocities += self.social_coefficient * social_random * (self.gbest - self.positions)
+        if monitor is not None:
+            monitor.lap("velocity")
+        self.positions += self.velocities
+        if monitor is not None:
+            monitor.lap("position")
+
+        costs = self.pallet_problem.evaluate_costs(self.positions)
+        if monitor is not None:
+            monitor.lap("evaluation")
+
+        improved = costs < self.pbest_costs
+        self.pbests[improved] = self.positions[improved]
+        self.pbest_costs[improved] = costs[improved]
+
+        best = np.argmin(costs)
+        if costs[best] < self.gbest_cost:
+            self.gbest = self.positions[best].copy()
+            self.gbest_cost = costs[best]
+
+        if monitor is not None:
+            monitor.lap("pbest")
+
+    def receive_migrant(self, position, cost):
+        """
+        Add a solution found by another swarm to the array-backed swarm, replacing the particle with the worst pbest.
+
+        Parameters:
+        position: the migrant solution
+        cost: the cost of the migrant solution
+        """
+        worst = np.argmax(self.pbest_costs)
+        if cost < self.pbest_costs[worst]:
+            self.positions[worst] = position
+            self.pbests[worst] = position
+            self.pbest_costs[worst] = cost
+
+        if cost < self.gbest_cost:
+            self.gbest = np.array(position, dtype=np.float64)
+            self.gbest_cost = cost
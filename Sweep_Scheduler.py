@@ -0,0 +1,87 @@
+import math
+import statistics
+
+import numpy as np
+
+import Test_PSO
+from Experiment_Runner import run_swarm_trials
+
+def welch_t(costs_one: list, costs_two: list):
+    """
+    Return Welch's t statistic for the difference in mean cost between two samples (positive when the second sample's
+    mean is higher).
+    """
+    variance = statistics.variance(costs_one) / len(costs_one) + statistics.variance(costs_two) / len(costs_two)
+    difference = statistics.mean(costs_two) - statistics.mean(costs_one)
+
+    if variance == 0:
+        return math.inf if difference > 0 else 0.0
+
+    return difference / math.sqrt(variance)
+
+def round_seed(seed, configuration: int, round_number: int):
+    """
+    Derive the experiment seed for one configuration's runs in one round, or None if the sweep is unseeded.
+    """
+    if seed is None:
+        return None
+
+    return int(np.random.SeedSequence([seed, configuration, round_number]).generate_state(1)[0])
+
+def successive_halving_sweep(configurations: list, runs = 100, initial_runs = 10, keep_fraction = 0.5, significance = 2.0, workers = 1, seed = None):
+    """
+    Run a sweep over run_test-style configurations, dropping configurations that are clearly worse as results come in.
+
+    Every surviving configuration is run in rounds. After each round, configurations are ranked by mean cost, and the
+    best keep_fraction of them survive (successive halving). Any other configuration that is not significantly worse
+    than the best one, by Welch's t test, also survives (racing). Each round doubles the number of runs given to the
+    survivors, until they reach runs. A summary row is then written for each survivor, exactly as run_test does.
+
+    Parameters:
+    configurations: a list of dictionaries of run_test parameters, each containing 'LSI', 'swarm_size' and 'run_time'
+    and optionally 'cog_coefficient', 'array_engine' and 'max_evaluations'
+    runs (optional): number of runs a surviving configuration ends with. Default 100
+    initial_runs (optional): number of runs every configuration gets in the first round. Default 10
+    keep_fraction (optional): fraction of configurations that survive each round on rank alone. Default 0.5
+    significance (optional): t statistic above which a configuration is considered worse than the best. Default 2.0
+    workers (optional): number of worker processes, or None for one per CPU. Default 1
+    seed (optional): experiment seed from which every round's seeds are derived. Default None
+
+    Returns: a list of (configuration, costs) pairs for the survivors
+    """
+    costs = [[] for x in configurations]
+    solutions = [[] for x in configurations]
+    survivors = list(range(len(configurations)))
+    round_runs = min(max(initial_runs, 2), runs)
+    round_number = 0
+
+    while True:
+        for index in survivors:
+            configuration = configurations[index]
+            new_runs = round_runs - len(costs[index])
+            results = run_swarm_trials(Test_PSO.FILE, new_runs, configuration['LSI'], configuration['swarm_size'], configuration['run_time'],
+                                       configuration.get('cog_coefficient', 1.1193), configuration.get('array_engine', False), workers,
+                                       round_seed(seed, index, round_number), configuration.get('max_evaluations'))
+            for result in results:
+                solutions[index].append(result[0])
+                costs[index].append(result[1])
+
+        if round_runs == runs:
+            break
+
+        ranked = sorted(survivors, key = lambda index : statistics.mean(costs[index]))
+        kept = ranked[:max(1, math.ceil(len(ranked) * keep_fraction))]
+        best = ranked[0]
+        survivors = [index for index in ranked if index in kept or welch_t(costs[best], costs[index]) < significance]
+        print(f"Round {round_number}: {len(survivors)} of {len(ranked)} configurations survive with {round_runs} runs each")
+
+        round_runs = min(round_runs * 2, runs)
+        round_number += 1
+
+    for index in survivors:
+        configuration = configurations[index]
+        Test_PSO.write_test_result(runs, configuration['LSI'], configuration['swarm_size'], configuration['run_time'],
+                                   configuration.get('cog_coefficient', 1.1193), costs[index], solutions[index])
+
+    print("Sweep Complete!")
+    return [(configurations[index], costs[index]) for index in survivors]
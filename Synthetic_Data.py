@@ -0,0 +1,70 @@
+import argparse
+import sys
+
+import numpy as np
+
+# Fraction of measurements recorded as zero, as when a source reports nothing for the day
+ZERO_FRACTION = 0.2
+
+def generate_dataset(file_name: str, days: int, features = 13, seed = None, noise = 5.0, chunk_days = 100000, dtype = np.float64):
+    """
+    Write a synthetic pallet problem dataset with a known ground-truth solution to a .npy file.
+
+    Each day has features non-negative demand measurements, some of them zero, and a known demand equal to the
+    measurements combined with a planted set of weights plus Laplace-distributed noise. Since the noise is Laplacian, the
+    planted weights are (up to sampling error) the solution minimising the average estimation error, so solvers can be
+    checked by how closely they recover them. The file is written a chunk of days at a time through a memory map, so
+    datasets much larger than memory can be generated. It can be loaded with Pallets(file_name).
+
+    Parameters:
+    file_name: the location of the .npy file to write
+    days: number of days (rows) to generate
+    features (optional): number of demand measurements per day, and so of weights in a solution. Default 13
+    seed (optional): seed for the weights, measurements and noise, so that a dataset can be regenerated. Default None
+    noise (optional): the mean absolute deviation of the noise added to each day's demand. Default 5.0
+    chunk_days (optional): number of days generated and written at a time. Default 100000
+    dtype (optional): the floating point type written. Default np.float64
+
+    Returns: the planted weights, as a list of features floats
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.uniform(-1.0, 1.0, features)
+    data = np.lib.format.open_memmap(file_name, mode="w+", dtype=dtype, shape=(days, features + 1))
+
+    for start in range(0, days, chunk_days):
+        count = min(chunk_days, days - start)
+        measurements = rng.gamma(2.0, 25.0, (count, features))
+        measurements[rng.random(measurements.shape) < ZERO_FRACTION] = 0.0
+
+        data[start:start + count, 0] = measurements @ weights + rng.laplace(0.0, noise, count)
+        data[start:start + count, 1:] = measurements
+
+    data.flush()
+    del data
+
+    return weights.tolist()
+
+def weights_file_name(file_name: str):
+    """
+    Return the location the command line tool saves a dataset's planted weights to.
+    """
+    return f"{file_name[:-len('.npy')] if file_name.endswith('.npy') else file_name}.weights.npy"
+
+def main(arguments = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic pallet problem dataset with planted weights.")
+    parser.add_argument("file", help="location of the .npy file to write")
+    parser.add_argument("--days", type=int, default=1000000, help="number of days to generate")
+    parser.add_argument("--features", type=int, default=13, help="number of demand measurements per day")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the generator")
+    parser.add_argument("--noise", type=float, default=5.0, help="mean absolute deviation of the demand noise")
+    parser.add_argument("--float32", action="store_true", help="write single rather than double precision data")
+    args = parser.parse_args(arguments)
+
+    weights = generate_dataset(args.file, args.days, args.features, args.seed, args.noise, dtype=np.float32 if args.float32 else np.float64)
+    np.save(weights_file_name(args.file), weights)
+
+    print(f"Wrote {args.days} days with {args.features} measurements to {args.file}; planted weights saved to {weights_file_name(args.file)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,69 +1,120 @@
+import ast
 import statistics
 import time
 import csv
-from Swarm import Swarm
+
+import numpy as np
+
 from Pallets import Pallets
+from Experiment_Runner import run_swarm_trials
 
 FILE = "data/cwk_train.csv"
+OUTPUT = "data/test_results_training_file.csv"
 
 fieldnames = ['Runs', 'LSI', 'Swarm Size','Run Time', 'Cognitive Coefficient', 'Mean', 'Standard Deviation', 'Costs', 'Solutions']
 
-def run_test(runs: int, LSI: bool, swarm_size: int, run_time: int, cog_coefficient = 1.1193):
-    pallet_prob = Pallets(FILE)
-    swarm = Swarm(pallet_prob, cog_coefficient)
-    
+def run_test(runs: int, LSI: bool, swarm_size: int, run_time: int, cog_coefficient = 1.1193, array_engine = False, workers = 1, seed = None, max_evaluations = None, store = None):
     results = []
     result_costs = []
 
-    for i in range(runs):
-        if LSI == True:
-            result = swarm.timed_swarm_search_with_lsi(swarm_size, run_time)
-        else:
-            result = swarm.timed_swarm_search(swarm_size, run_time)
+    # Optionally stream every run into a Result_Store as soon as it finishes
+    on_result = None
+    if store is not None:
+        name = f"pso_lsi_{LSI}_size_{swarm_size}_time_{run_time}_cog_{cog_coefficient}_array_{array_engine}_evals_{max_evaluations}"
+        configuration = {'LSI' : LSI, 'Swarm Size' : swarm_size, 'Run Time' : run_time, 'Cognitive Coefficient' : cog_coefficient,
+                         'Array Engine' : array_engine, 'Max Evaluations' : max_evaluations}
+        on_result = lambda result : store.append(name, result[1], result[0], configuration)
+
+    for result in run_swarm_trials(FILE, runs, LSI, swarm_size, run_time, cog_coefficient, array_engine, workers, seed, max_evaluations, on_result):
         results.append(result[0])
         result_costs.append(result[1])
 
+    write_test_result(runs, LSI, swarm_size, run_time, cog_coefficient, result_costs, results)
+
+    print("Test Complete!")
+
+def write_test_result(runs: int, LSI: bool, swarm_size: int, run_time: int, cog_coefficient, result_costs: list, results: list):
+    """
+    Append the summary row for one test configuration to the results file.
+    """
     mean = statistics.mean(result_costs)
     stdev = statistics.stdev(result_costs)
 
-    with open('data/test_results_training_file.csv', mode='a') as csv_file:
+    with open(OUTPUT, mode='a') as csv_file:
         writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
         writer.writerow({'Runs' : runs, 'LSI' : LSI, 'Swarm Size' : swarm_size, 'Run Time' : run_time, 'Cognitive Coefficient' : cog_coefficient, 'Mean' : mean, 'Standard Deviation' : stdev, 'Costs' : result_costs, 'Solutions' : results})
 
-    print("Test Complete!")
-
 def compare_solutions_on_different_datasets(file1 : str, file2: str, solutions: list):
     """
     Compare the results produced by a list of solutions on two different datasets.
     """
-    pallets_one = Pallets(file1)
-    pallets_two = Pallets(file2)
-    dataset1_costs = []
-    dataset2_costs = []
+    compare_solutions_on_datasets([file1, file2], solutions)
 
-    for solution in solutions:
-        dataset1_costs.append(pallets_one.evaluate_cost(solution))
-        dataset2_costs.append(pallets_two.evaluate_cost(solution))
+def compare_solutions_on_datasets(files: list, solutions: list, output = 'comparing_datasets.csv'):
+    """
+    Compare the results produced by a list of solutions on any number of datasets, writing one row of costs per dataset.
+    """
+    costs = score_solutions_on_datasets(files, solutions)
 
-    with open('comparing_datasets.csv', mode='w') as csv_file:
+    with open(output, mode='w') as csv_file:
         writer = csv.writer(csv_file)
-        writer.writerow(dataset1_costs)
-        writer.writerow(dataset2_costs)
-
-# Test different swarm sizes
-#run_test(100, False, 30, 15)
-#run_test(100, True, 30, 15)
-#run_test(100, False, 100, 15)
-#run_test(100, True, 100, 15)
-#run_test(100, False, 500, 15)
-#run_test(100, True, 500, 15)
-
-# Test with different cognitive coefficient
-#run_test(100, False, 100, 15, 1.5)
-#run_test(100, True, 100, 15, 1.5)
-#run_test(100, False, 100, 15, 1.8)
-#run_test(100, True, 100, 15, 1.8)
-
-# Compare a set of solutions on the two different datasets
-SOLUTIONS = [[0.9302016390570997, 0.4490373156115222, -1.269217407253632, 2.3065813688026306, -2.6763239786898554, 0.14749140401561914, 0.0028133436952706642, 0.9571118155856959, 100.73779648361301, 101.16109560601733, 76.48326072498244, 41.70911980344192, 39.886283459031006], [1.2103600928929128, -0.09202396297945234, -0.3094879995485397, 1.7913536807041472, -2.3283074432018833, -0.004348397150747719, 0.13066165028191248, 1.0200906069793494, 96.46038794087251, 142.51989594901926, 126.80047128294389, 94.94893601291642, 104.06690983019645], [0.9782291463085847, 0.333755669265449, -1.2263535658833564, 2.108939999220196, -2.7630053286293665, 0.24243460855834265, -0.08053092782835883, 0.9957334875218286, 95.65627112646557, 105.14554818258314, 82.82239162602896, 52.19876007956984, 50.767991381001906], [1.3822838391105492, 0.33111350529382383, -0.4577810111642039, 2.6901915036031165, -2.740603072712513, -0.04469828706988909, 0.12967837024409892, 0.4907709420540358, 93.51105418604801, 96.82221846021038, 74.26873366942075, 29.209192625900805, 26.98584842627773], [1.5724634757235951, 0.026978514711840738, -0.2738510811259408, 1.5977380671263495, -2.545325950922345, -0.378348506318641, 0.4965755797432791, 1.4202174886838512, 98.53509091328448, 127.99073169312346, 113.97774486260494, 86.26090245177554, 90.95344642120546], [0.9008961732763393, 0.2392195048028815, -1.0996638894687296, 1.835612894605401, -2.814232433915421, 0.5580866084414244, -0.39888258075636746, 1.0067720373950726, 89.28856179584587, 100.1505017925676, 75.08859563899874, 56.17186900925023, 58.62318177268591], [0.65705471074636, 0.3567811825836535, -1.2706486450788506, 1.6328662943053436, -2.370411580355292, 0.8117518824647005, -0.6964089371297943, 0.8340931027382451, 92.3239066452128, 81.00879734355361, 62.59253133455313, 51.909220938644786, 41.17811290698571], [1.3084377708390251, -0.13307533949882747, -0.24351577598222537, 1.793998095391125, -2.41340137952053, -0.22170821503423024, 0.36188912390245714, 1.1331088469265223, 100.06495392605305, 155.3382814224863, 138.50489925494838, 107.85034825208055, 114.29481862515387], [1.2282522647437901, 0.46459413773224745, -1.0912945610620637, 2.33263563675002, -2.564795803893445, 0.1122674446419692, 0.07119193657866271, 0.768551730299904, 88.44598771339933, 76.58745406568244, 57.18071673710202, 23.523992472167627, 17.80925466142816], [1.0484796968605525, -0.05296843638571697, -0.4662472930261504, 1.6320601316311245, -2.232151160161968, -0.02007087513754548, 0.17204535406183843, 1.2044579057643523, 101.38915744287877, 149.4553653383541, 130.58429198360733, 101.70986685920184, 108.8874563392163], [1.3738290456446274, 0.19056929000039574, -0.5928627443943368, 1.6137903636838102, -2.31778267997627, -0.21193226679117916, 0.33956961874565206, 1.4012012146967865, 96.8855379726721, 111.12257036775, 96.01248526508641, 67.98742342945411, 71.6200362665464], [1.292232714530479, 0.06525170594466871, -0.6028821525865787, 1.7306274196128315, -2.8947601111643144, 0.20865745266303787, -0.040798485706829944, 1.2128856603352625, 85.24044067591397, 103.9470753465004, 88.72362324563844, 67.11091871864573, 81.07821717591516], [1.0797376048714538, 0.3072610290487078, -0.8783401995446984, 2.208495745447034, -2.5250540189413084, 0.19758796812259638, -0.09523494996894007, 0.8153118377608732, 96.203736534453, 101.80552156677922, 82.79190270037193, 49.72356054046686, 44.21380017013731], [1.4416740397684364, -0.010040913286582067, -0.14007269794167201, 1.6463977585153304, -1.7205293606365215, -0.10019720521712139, 0.19271772724414266, 0.7599702879017132, 92.65870127655631, 119.3271920344022, 113.02345133226424, 81.1908577905724, 77.42288983763767], [1.1333867607294388, 0.48803933848719766, -1.0263250219729358, 1.784118912570145, -2.5467037273075137, 0.41355737877903187, -0.30426246075757785, 0.8576524158860318, 87.50598964590911, 60.07458543855494, 42.74391400571662, 19.450135786932236, 12.556941288620893], [1.0295777148841183, 0.10561508302934772, -0.6125159214911968, 1.9989920697530363, -2.443309398752874, 0.3571306595547746, -0.2566484437730934, 0.7547843650193024, 92.93169685476236, 114.44326081910022, 96.49745456753308, 69.62231647852974, 70.63595598303287], [1.426618063219196, -0.15592785937749412, -0.0555876673801318, 2.237350666802671, -2.4025505276766523, -0.1139435928313604, 0.24808406778003844, 1.0513169579373178, 86.35617528115466, 142.1168309262587, 125.18922526881684, 90.9657905125626, 101.3409447743001], [0.9788273464588181, -0.2289612062790563, -0.4164842802646353, 1.6348606677555968, -1.9254642706872682, 0.14244882595982053, -0.04840947744290305, 0.9193302274323285, 101.83227540886567, 165.54596739929679, 156.52410737346455, 121.84596055569301, 132.44614057600458], [1.1749773521279792, 0.1923899643910547, -1.0468637371313516, 1.7274593521457, -2.575497895348079, 0.1310024691909859, 0.02147743337777493, 1.1597123455413334, 92.20371276824842, 110.06672709977661, 92.65220238896796, 69.22687791514417, 68.3977854950727], [0.9407014056034988, 0.15971256821611945, -0.915970693601628, 1.8951168034938484, -2.7164157675684124, 0.4352145117449832, -0.2895238276846696, 0.9850881281995961, 92.0630068215914, 115.59873179409193, 89.15691501939511, 66.13196499170041, 70.66039926891817], [1.281272741885229, -0.06813391657802499, -0.41432254426156134, 1.5590026358553888, -2.3600547639423817, -0.153516644642295, 0.3137287035930052, 1.3218204481627849, 96.74815971321432, 147.31528336072424, 126.33720954208067, 99.7711163566419, 106.8192433286374], [0.869265508455485, 0.30416293886791945, -1.216666636312597, 1.8823722016936761, -2.503416872482455, 0.48387991084395626, -0.3520275260489634, 0.879514354462262, 93.66690170140996, 96.94771425989958, 78.55044319494067, 55.31367329064093, 49.70104903898674], [0.9176895470931258, 0.5208892603670885, -1.4676166746100565, 1.7936422385585677, -2.9146435057153663, 0.26475147244520303, -0.10101645552650826, 1.279940672582949, 98.81268611510896, 84.62969683078126, 59.60428049028041, 37.52993051665646, 37.02194018688345], [1.5550096413844996, -0.0036751050827719687, -0.26660136709518445, 2.504972549073045, -2.8252950861096138, -0.10574016548949966, 0.2141603499461666, 0.6894132688409219, 87.14292309117393, 124.63085106973787, 109.49687250864642, 64.71715146887405, 77.94286828954358], [0.678176247723475, 0.015331086970249123, -0.8312161367242176, 1.6869052096803774, -1.1645640328931777, 0.29472803013193366, -0.22165152137628327, 0.9781016863032855, 101.2529610417588, 147.06884774350107, 136.37551254993136, 105.67994732459239, 99.49733247606099], [1.507254192522168, 0.4875528265311708, -1.0012951716338012, 1.6200328800893895, -2.585623920395767, -0.3082821995540738, 0.4825067191389356, 1.3657754827170843, 92.97666843271936, 79.84948581710843, 61.36520573354575, 32.47974536840427, 35.51536390120399], [1.2750163372110255, 0.16571799277827926, -0.6285202636041038, 2.5833234712298223, -2.915922510477616, 0.05944664716758425, 0.06555553972527976, 0.7361898789686102, 91.85722792059275, 115.08227660618324, 95.9477397803647, 53.25035508419271, 59.35365570069348], [1.0326350457154323, 0.170505437854062, -0.8934187832466371, 2.0765239668334603, -2.283935284778951, 0.058573547025098927, 0.05565501676143429, 0.86406379674919, 101.33123182005686, 129.5349588586353, 111.20835439088322, 74.39857122096738, 73.66350672845878], [1.2253996974331747, -0.14593060984943332, -0.19433583598360718, 1.9054719509897546, -2.542535289440718, 0.10333715797267048, 0.005710661384551622, 0.8669325734390486, 95.31528282658567, 141.26873357407257, 126.20423417361994, 95.1404038720797, 107.73226881659377], [1.0695494640476504, 0.07082781355749898, -0.6291376443609842, 2.113607048044935, -3.005635273382092, 0.16679451388605965, 0.02239583911399478, 1.2348950568774504, 93.59023365474675, 127.59456282191047, 101.00591627793914, 72.2715521603929, 85.2680105366041], [1.2040249336188502, 0.14265364742141312, -0.8453864752399344, 1.4762544480134734, -2.5928551925160823, 0.061386094565851694, 0.12200770067852973, 1.3793257745952203, 91.97499994719014, 110.19622046140015, 94.77096246321005, 75.0018670993255, 78.23942577655224], [0.5146502600244678, 0.05432297824368642, -0.9312191831069871, 1.3195632199911704, -1.2662866331343803, 0.6029731686991191, -0.5664962466233311, 0.67620885603084, 107.29534966289357, 136.36363036962365, 128.00490509234348, 105.84267498639512, 96.20654315985232], [1.0733964089891341, 0.1603183236725634, -0.8973329548233194, 1.8743218342919372, -2.5977832479092497, 0.3694161325909619, -0.20590272535652318, 0.9291384418599941, 88.41270182959275, 100.89229494250405, 86.41217352370184, 61.50163642490906, 64.8814847186473], [1.07823768402269, 0.014071549622289747, -0.7080502280054026, 1.842179701649807, -3.0054384158312146, 0.21636506228316343, -0.04787876798236066, 1.3891941693628467, 92.57517296384835, 125.55474276665223, 105.5532949534327, 83.50625319946064, 97.49367744397564], [1.6116127082565332, 0.15545199966677142, -0.43872385567548344, 1.8289033980696752, -2.4943681157371396, -0.29965964317061333, 0.4399367231313422, 1.0574080006508293, 91.35678726419981, 110.39794456988268, 95.95605076273262, 60.63071900767846, 63.669363931220936], [1.1402089300944336, 0.2842847817265538, -0.8821941342878196, 2.7609221511873003, -2.8352226130918465, 0.10438585746174564, 0.050134971625893664, 0.6534671115794003, 93.91222686016627, 109.23301627277623, 86.24886734356059, 42.41320081177106, 46.22865986710812], [1.13344110591779, 0.19868219772610338, -1.0374240631225966, 2.1321749649154955, -2.831441317640997, 0.4156770751362016, -0.2860759172902869, 0.7633652332542884, 86.51848414279044, 107.15953142903575, 80.7121609855682, 53.07216128751877, 57.87570786962339], [1.3513286336320087, -0.041516309719676084, -0.3474870009061069, 2.348131042569806, -2.757225993342618, -0.16199208921904076, 0.30217366151321023, 0.9100542156772788, 95.4931684106814, 142.5379353035939, 125.53583560829207, 83.44716831126416, 94.49850779558072], [1.3320159646313234, -0.0374280748477091, -0.2833257437511261, 2.007127527675724, -2.3379471994543586, -0.0944831963602554, 0.21551888012812773, 0.9511661246276878, 93.2189734663493, 134.44250233212344, 120.39204327151621, 83.76084994866737, 90.52735498227642], [1.031076450727516, 0.13475994278882905, -0.8845309138689357, 1.7694222576677385, -2.4084411256136136, 0.45982688880187733, -0.31941722977906556, 0.8391989560299242, 88.56664637188808, 101.10028370681587, 89.51177806417665, 65.8647159826344, 66.29453184159901], [0.9379851596364037, 0.2881084254657432, -1.2944030009330778, 1.8011816977197668, -2.783305443035784, 0.2867089372141111, -0.09194819734043765, 1.2218483902895987, 94.21567419449426, 103.82210345701849, 84.41738154408391, 62.313109348532315, 61.87384110369115], [1.1569063547690273, 0.03307567521882043, -0.6023657701295686, 1.8862884184898527, -2.425185162339594, -0.09551093898804797, 0.2406749751831612, 1.2321381470522428, 100.17443004696514, 138.2215995103956, 121.27310197329591, 89.44863037706594, 94.56386592553184], [1.5770871190584197, 0.06939533215027793, -0.5123506496669687, 1.9358781937988696, -2.7871926320336993, -0.24039021073403816, 0.39233778486317583, 1.156774353940143, 89.76012324109179, 119.56893051499637, 103.82939984947349, 71.030146522616, 81.30890025558588], [1.6261647471379994, 0.2589975913575634, -0.5237528151903874, 1.8614728669878642, -2.6765603194666077, -0.2895939822959045, 0.4237093791742933, 1.1081159616487648, 90.84627393619898, 96.92940899124099, 81.83788386070357, 47.31214649530606, 50.46932585487093], [1.4047924383318668, 0.26486710894958426, -0.7270917877758923, 2.1214145926572354, -2.718154712245699, -0.14887451766281704, 0.2867335182213926, 1.0799961201096995, 93.29741233710037, 107.47056612814028, 87.22551299143329, 50.73614174181394, 52.40509032790103], [1.2524714991132433, -0.19976962882219668, -0.2931359377625565, 1.628536071340699, -2.7157140989190935, -0.06360149549933411, 0.2300239714228244, 1.4894049902963808, 94.79755987062144, 151.20205727592963, 134.5628765881773, 110.96209975044799, 128.76720016393458], [1.1273877150816085, -0.20236838230793255, -0.314651798078202, 1.7889344239066567, -2.1496137723424016, -0.06421645556392455, 0.18285663939311333, 1.004232917099785, 101.78719550781187, 166.16838186315357, 152.54941473241945, 119.09442176138451, 127.59859512141668], [0.8309575652160233, 0.4163185162142177, -1.460856832095863, 1.867162913405885, -2.7560418498588084, 0.4910243983444891, -0.31931308392849916, 1.0487745156555979, 93.0329488915972, 86.24188899601134, 66.02580557318072, 43.85782543967759, 40.13155237045689], [0.694897545689008, 0.263743923251771, -1.275128023027497, 1.6306096182598546, -2.361751229726659, 0.7018782526943979, -0.5747563846959814, 0.90136900966716, 93.69512871713393, 100.1841831994626, 81.19336791844815, 64.0326918732509, 59.98996291717555], [1.2825251476935184, 0.06160089316327555, -0.6588519391292323, 0.7725696251348444, -2.3243615056731546, 0.22220139968813207, -0.039377959111435074, 1.2703191679557806, 85.14094986105258, 98.83714910451597, 88.32913104931174, 79.69297508255326, 87.417618958324], [0.7908547860132223, 0.3785128997261308, -1.3410277333754668, 2.1225063188081603, -2.6188982055707215, 0.43043421336330795, -0.28326491661555836, 0.8564899077353006, 97.1486218838836, 99.56538325297748, 78.30819599306999, 49.05119860681074, 45.8712848518289], [1.3180236084515502, -0.23663416010718913, -0.23582421446353644, 1.761091681254518, -2.8223356782493014, -0.00654712781373582, 0.16588721070280213, 1.1830544326845562, 92.91484643344765, 153.02857716649982, 136.58293403004603, 107.91475325624657, 126.42545834147539], [1.4378884869707655, -0.4163336406094596, 0.3683023252033708, 1.9080765773954653, -2.2771084005393805, -0.4125388211362994, 0.6131042005937893, 1.3199766535985427, 97.45018577666934, 180.3146787476526, 165.0499603842522, 140.84036702339728, 148.3826962063989], [1.3624248672909989, -0.027588973056500675, -0.3891051984995732, 2.6335387954702676, -3.0881844712097166, -0.024219143129605467, 0.16573876968515674, 0.7692116338120492, 90.6592511490029, 135.15189760311458, 116.32045720516712, 72.19869291363106, 88.77017133537724], [0.9088484301675541, 0.17408029478667444, -0.9998356783979536, 1.6222375853295539, -2.6066574397599784, 0.5360845612166293, -0.3848061027006932, 1.0592610526208786, 89.88259929439572, 99.1415939851178, 82.94757159623433, 66.4629475852047, 68.28258103804944], [1.0541761759217847, 0.06691183620999172, -0.609308287912744, 2.3445097495254554, -2.459740676734543, 0.24562544998236074, -0.13332284869905014, 0.581717892729385, 95.22333696104836, 126.18493449561304, 109.85515195818925, 71.42395316372546, 76.06332658108329], [1.4622578783734885, -0.01795475413713434, -0.22225308597436844, 2.3032600281404436, -2.5405953987683803, -0.1465772563034648, 0.2674097631912288, 0.7681012015649983, 91.2648783987711, 129.7968438201784, 116.22678784232373, 73.14650948234699, 82.70842585053198], [0.9651441686269479, 0.34354692483048643, -0.8950313076068371, 2.2148485020472366, -2.5611944819626467, 0.4551741018960518, -0.3734825134149794, 0.5357780198474774, 94.78342659554761, 90.7010257239446, 70.90813764021485, 42.377268667604994, 34.73292850977442], [0.8251000067014183, 0.23444095245130603, -1.1335874621259814, 1.7161831122245446, -2.6238039864006013, 0.6110019268960054, -0.4658545846145698, 1.007111740140073, 90.99177174609933, 97.76960939649781, 78.07578402442195, 61.095408235937725, 60.98580509037467], [0.6790906704582343, 0.36938889012821674, -1.2009316055247672, 1.7132993288901157, -2.0869729456011306, 0.6183689929098749, -0.5276059458873347, 0.7467530804767486, 98.45725588932287, 91.8073938779366, 74.15360947224505, 56.06056055529549, 42.818390506925134], [1.3963060439756634, -0.042584012510543015, -0.22921462629678474, 1.4733275341171312, -1.8361300578047832, -0.07743201235522042, 0.19928366998692004, 0.9688283161820749, 92.22698610196554, 122.37310988120936, 115.36080539210162, 87.45242021223488, 88.19292520105961], [1.3766837064370554, -0.05388333994199556, -0.1147515474218684, 2.5611426423829955, -2.680520407279585, -0.047598096507773094, 0.13594085020268515, 0.5728286518504117, 93.61770992077693, 137.6566109699581, 120.7647610948761, 75.09755975188882, 85.8038595299041], [1.455708429345398, 0.008019536696587238, -0.16235505563050945, 2.038512810255782, -2.41583410421426, -0.22293770327872678, 0.32181364203628227, 1.0555074790879249, 95.51576932975478, 129.04965579910993, 114.08041646387315, 78.6725217791327, 83.14666372142854], [2.0686695116709775, 0.35997895719169964, -0.30131297491736675, 1.4875423365313443, -3.4901991749569827, -0.712284236314877, 0.8715610938740345, 1.2021223894497022, 102.02845749107712, 87.77063727168267, 65.13988242715244, 32.6148839885398, 47.4958330857253], [0.9442310845602951, 0.04400503574417752, -0.6268687095995397, 1.9881184603147666, -2.3630919149364673, 0.2863605885881578, -0.17778104436204697, 0.8791610915135676, 98.08023850959557, 134.79936656495153, 111.86219428878822, 82.65385361834953, 87.50558272483629], [1.2537164263028708, 0.17253982275585866, -0.8963975536624439, 2.0271012838167763, -2.8615515987246063, -0.0717977270410777, 0.2596768074281483, 1.1991691468850196, 94.01187340132715, 121.57318561365109, 100.87351469528008, 69.49577950812487, 72.90455050188915], [0.7333147795912917, 0.36853380242728573, -1.1186981695180742, 2.06300219107494, -2.2713283995220994, 0.6159256972619123, -0.537677393298084, 0.5614368473130908, 97.19629518970174, 92.3179773372045, 73.32414161819702, 49.2086267326706, 37.96358120065078], [0.563393445347373, 0.5640556986244215, -1.551482426485635, 2.0962233738625624, -2.681769620190156, 0.7838593447366203, -0.667007952475428, 0.6305588596312742, 98.6304934738409, 73.33871722381053, 48.49988706853224, 29.186181630431506, 17.618813862248395], [1.2599000371972453, -0.02013313291340044, -0.34335939714430563, 2.4318546247603607, -2.583892936533312, -0.051369168758146046, 0.16447539462429994, 0.6916489055513076, 96.67144613466017, 140.80686185765387, 124.11935034741937, 78.94433472941006, 89.12375220724529], [0.9616644644990625, 0.1322065983269875, -0.8627188519736415, 1.9831817761982815, -2.5469543651610222, 0.26732642570464415, -0.1254090245256876, 0.9352124747123988, 96.45047396566648, 121.39741203387499, 102.94544450481072, 72.77018681862502, 77.6001902869614], [1.0968799377460414, 0.1977194005029014, -0.9438379481026622, 1.8210868063217205, -2.65792287977391, 0.17480384580355604, -0.008336510747715005, 1.1293540876803478, 93.08585599246025, 108.85971561552495, 91.59004713331967, 65.5546336212891, 66.81846059528812], [1.6397116849733817, 0.037874779915897896, -0.1658457677965601, 2.1591360800442945, -2.561725290782182, -0.2147498546587094, 0.32802250732595917, 0.7777200065814978, 88.54496705244462, 116.54740660857063, 103.74804195569243, 61.96920704943029, 72.59516753237037], [1.383579523358263, -0.12679364760379158, -0.30281542340750783, 1.9414941672953596, -2.2988836880529653, -0.30777395798417967, 0.4859804495530372, 1.3027472632575712, 96.40344121485177, 150.52085931438543, 136.59601640753252, 103.34479826403457, 109.88883176038782], [1.1387328546984163, -0.1889505014693122, -0.16606458603402155, 1.3863627952001463, -1.9562267636985127, 0.024635235344190202, 0.08705937224242855, 1.14474109343551, 98.8144800716848, 148.48214364584126, 137.25583778377185, 117.31905440111242, 120.60091528812018], [1.0887615377441118, -0.06365079690752114, -0.5835979789877517, 1.6888003963930158, -2.2097038682506023, 0.1042906692303891, -0.0050082762955667845, 1.1990828398177844, 99.25796989830712, 146.4076845952354, 129.15265485962263, 99.95051810441808, 104.89728756164129], [1.1179661807942585, 0.2203156027748997, -0.924150092773046, 2.3645027526361533, -3.0523043855443728, 0.26775076460461733, -0.11097792511647325, 0.900735421424577, 90.01352077868775, 109.44457858719043, 84.52146413080669, 50.98300122019333, 57.36391540228729], [1.0728544483427707, 0.10772150413306815, -0.8382891045570776, 2.097672760788931, -2.85914377127937, 0.22469266692113563, -0.0585308734096836, 1.049022684026515, 92.52813941131853, 119.14393404698856, 100.23160621524161, 70.87011474124073, 78.75561451155617], [1.3267253620865735, -0.1104474927776786, -0.3010789097464591, 1.814709648834649, -2.577816884596089, -0.07859970289696153, 0.2327094247188941, 1.1503984318551665, 93.08113991785656, 139.12208231926172, 125.04867499363282, 94.8240668685049, 107.91277129053745], [1.2196406265666366, 0.4374871957703738, -0.8392264776196663, 2.409671471957696, -2.7289351371310486, 0.12114007571526993, -0.014280451591587435, 0.7229047344038215, 93.38236421471422, 83.89124768979866, 61.58915986597128, 23.497844824619115, 20.79090048974474], [0.8673024694692467, -0.198705454838275, -0.21041273401843516, 1.1803118546637033, -1.4676396957275388, 0.23201116919831785, -0.1607757820372971, 0.9935840989163228, 104.19237236629169, 160.56467340024867, 143.34412069144327, 125.17309509339601, 126.28826417564652], [1.5119552956863678, -0.18994631091663725, -0.20469866765694766, 2.0223380565272118, -2.1841799564581432, -0.2329938918139878, 0.42287194389110117, 0.9820067433190557, 86.80498827399153, 144.10796166958033, 135.37808025633467, 99.40382173706847, 108.2822856464905], [1.1612463074742319, 0.26769416002093305, -0.8463245001675924, 1.734275243819911, -2.51716283105377, 0.20805233248429536, -0.08011580107353108, 1.1231776101113469, 91.79094856571774, 93.14994229814812, 77.00276643996408, 54.640809367143135, 51.1121776636853], [0.8055990466917002, -0.1989362743354905, -0.35596392634800017, 1.1030509191725197, -1.298017549249054, 0.35588395559738933, -0.3081380697959131, 0.8993954025969217, 103.47133153173922, 152.63751166703574, 147.34343853800615, 126.98146096129788, 125.40141336839113], [1.3385776527086952, -0.09712754141862527, -0.18921564856298542, 2.229520823726599, -2.5862052324812206, -0.09180519768335013, 0.2125391624862228, 0.8459661220163398, 94.43050204714247, 144.73870461045001, 127.17032822907215, 86.56774269403552, 99.12652019424095], [1.1586500502955759, 0.42894424497631634, -1.1527428721069923, 1.392032878715516, -2.3741952921856653, 0.1820961370609004, -0.03407766237303448, 1.240145825562898, 91.70473234278373, 77.51034448621324, 61.30522052585328, 43.50575237901882, 38.63751589487365], [0.9564692694353015, 0.19277027762164858, -1.1438758405123899, 1.5807071078023358, -2.5718607374187124, 0.4243692091408028, -0.2669012491158087, 1.1331051899181355, 91.2837508038526, 103.14269549317778, 88.10726626658256, 68.47501615012898, 69.34070754818441], [1.1104298688800862, 0.3094583314316289, -0.9377529170410832, 2.2958566020087328, -2.822822954831622, 0.1675833892784006, -0.03437888689732251, 0.8359597446989049, 94.55169536069482, 102.78778277746282, 81.77473146747813, 46.62540085401749, 45.99077400203352], [1.34869104799901, 0.20067208517059149, -0.29624043047505505, 2.5030391410017305, -2.4356242738510248, -0.02912759438771411, 0.08813903786678601, 0.463554855438854, 95.44975882497423, 110.88685117497425, 92.3833538876352, 51.07273130304404, 45.32784631659684], [1.2451487383544968, -0.050061627567397265, -0.7363490170932242, 1.62858159852686, -2.637094887565388, -0.21125547987965623, 0.39632561956227, 1.4207398983739534, 98.98349026606232, 150.63180913274073, 135.5838523021731, 107.31974942127611, 112.6692977449575], [1.1068673884307865, -0.012484003430979359, -0.5305792869471933, 2.088393777479767, -2.6452219902578165, 0.17810422812507715, -0.04188740752542613, 0.9007794784860285, 94.21686876391894, 132.18539025454638, 114.78292566983957, 81.61664823042786, 92.56536909723432], [0.8745083412882011, 0.5064035569916483, -1.4707649537619254, 1.7647158358231994, -2.718960903088472, 0.6855456803853183, -0.5288427823646092, 0.9576807071724623, 85.7672718213434, 58.9226274270555, 41.00315137552681, 23.42871719255388, 16.40553628260039], [1.066758921394331, -0.020082231625552484, -0.5774874621143938, 1.852995530673081, -2.653341654569988, 0.225425750859314, -0.08034096127765766, 1.2364005274934695, 93.81975650363518, 127.98423583761365, 110.56062203538234, 85.67447479338675, 96.93747059759492], [0.9152236837351978, 0.2224944362884378, -1.0837177311973547, 1.7206745635687273, -2.822921893286977, 0.5296978421187257, -0.3505667724996553, 1.129641368760434, 88.32185162569105, 96.49416730647164, 75.65080844048747, 58.63611601754438, 62.55644367370282], [1.2781260544377635, 0.1620481401205422, -0.29806915191050104, 2.129584328338798, -2.1210458855114442, 0.08060047249068054, -0.04240861862697429, 0.5365341301162939, 95.67413971637166, 109.81754569389864, 95.42581245027549, 61.06224969383115, 51.58135977857045], [1.1171978241553209, -0.20133808842074247, -0.2202790661868261, 1.1020255212187537, -1.8645329338331653, 0.1361134838920573, -0.022587210520797915, 1.1842290795322576, 96.16805965949156, 142.58330009084906, 133.99188866788523, 117.84157217710225, 122.04662162583215], [0.914493341561159, 0.39672678257781246, -1.3005173842809066, 2.5854943144472333, -3.1591863707959225, 0.36729235214324174, -0.19335258542544467, 0.784889611875822, 93.63354599134051, 97.83630421331706, 71.30556277782273, 36.30938535244978, 39.1793932001034], [0.7615910763025368, 0.3577766719557999, -1.4070166615258053, 1.7953205977879967, -2.736194891275729, 0.8059146309593224, -0.66010832717423, 0.8802625429122533, 87.3946247996586, 77.88764361329234, 59.720654643444625, 44.31192395490257, 39.39909443610544], [1.1644733371120257, 0.33019176004676953, -0.8981173469122636, 2.5910865247257764, -2.964783232475021, 0.09120259898881784, 0.05254694969345469, 0.733815157156232, 94.40812993291651, 103.69349153107026, 79.92849757833397, 39.58475382986087, 40.77152803435574], [0.6816986832968683, 0.5339699816103304, -1.7016316707470303, 1.9388844199697666, -2.9187916343089118, 0.811615724565874, -0.6450630280827719, 0.9152428915271541, 89.03592133108945, 65.09268577573042, 43.251027449852735, 25.040634051132155, 20.234694696781197], [0.9475559727105743, 0.056712386779398716, -0.71251212953359, 2.1531440568827245, -2.406717719384638, 0.32458176914501197, -0.22284276285833954, 0.6761377299424411, 97.13093111419532, 133.754293417853, 113.13923757512724, 78.84706810472225, 82.79422247913854]]
-compare_solutions_on_different_datasets("data/cwk_train.csv", "data/cwk_test.csv", SOLUTIONS)
\ No newline at end of file
+        for dataset_costs in costs.T.tolist():
+            writer.writerow(dataset_costs)
+
+def score_solutions_on_datasets(files: list, solutions, block_size = 1024):
+    """
+    Evaluate every solution on every dataset.
+
+    Each dataset is loaded once and the solutions are scored against it in batches of block_size.
+
+    Parameters:
+    files: a list of locations of CSV files containing data for the pallet problem
+    solutions: a list of solutions, or a (solutions x weight_count) array, e.g. from read_solutions_from_results
+    block_size (optional): number of solutions evaluated together. Default 1024
+
+    Returns: a (solutions x datasets) array of costs
+    """
+    solutions = np.asarray(solutions, dtype=np.float64)
+    costs = np.empty((len(solutions), len(files)))
+
+    for j in range(len(files)):
+        pallet_prob = Pallets(files[j])
+        for start in range(0, len(solutions), block_size):
+            costs[start:start + block_size, j] = pallet_prob.evaluate_costs(solutions[start:start + block_size])
+
+    return costs
+
+def read_solutions_from_results(results_file: str):
+    """
+    Read every solution stored in the Solutions column of a results file written by run_test or test_random_search.
+    Rows without solutions, such as notes added to the file by hand, are skipped.
+
+    Returns: a list of solutions, in file order
+    """
+    solutions = []
+
+    with open(results_file, mode='r') as csv_file:
+        for row in csv.DictReader(csv_file):
+            if row['Solutions']:
+                solutions.extend(ast.literal_eval(row['Solutions']))
+
+    return solutions
+
+if __name__ == "__main__":
+    # Test different swarm sizes
+    #run_test(100, False, 30, 15)
+    #run_test(100, True, 30, 15)
+    #run_test(100, False, 100, 15)
+    #run_test(100, True, 100, 15)
+    #run_test(100, False, 500, 15)
+    #run_test(100, True, 500, 15)
+
+    # Test with different cognitive coefficient
+    #run_test(100, False, 100, 15, 1.5)
+    #run_test(100, True, 100, 15, 1.5)
+    #run_test(100, False, 100, 15, 1.8)
+    #run_test(100, True, 100, 15, 1.8)
+
+    # Compare a set of solutions on the two different datasets
+    SOLUTIONS = [[0.9302016390570997, 0.4490373156115222, -1.269217407253632, 2.3065813688026306, -2.6763239786898554, 0.14749140401561914, 0.0028133436952706642, 0.9571118155856959, 100.73779648361301, 101.16109560601733, 76.48326072498244, 41.70911980344192, 39.886283459031006], [1.2103600928929128, -0.09202396297945234, -0.3094879995485397, 1.7913536807041472, -2.3283074432018833, -0.004348397150747719, 0.13066165028191248, 1.0200906069793494, 96.46038794087251, 142.51989594901926, 126.80047128294389, 94.94893601291642, 104.06690983019645], [0.9782291463085847, 0.333755669265449, -1.2263535658833564, 2.108939999220196, -2.7630053286293665, 0.24243460855834265, -0.08053092782835883, 0.9957334875218286, 95.65627112646557, 105.14554818258314, 82.82239162602896, 52.19876007956984, 50.767991381001906], [1.3822838391105492, 0.33111350529382383, -0.4577810111642039, 2.6901915036031165, -2.740603072712513, -0.04469828706988909, 0.12967837024409892, 0.4907709420540358, 93.51105418604801, 96.82221846021038, 74.26873366942075, 29.209192625900805, 26.98584842627773], [1.5724634757235951, 0.026978514711840738, -0.2738510811259408, 1.5977380671263495, -2.545325950922345, -0.378348506318641, 0.4965755797432791, 1.4202174886838512, 98.53509091328448, 127.99073169312346, 113.97774486260494, 86.26090245177554, 90.95344642120546], [0.9008961732763393, 0.2392195048028815, -1.0996638894687296, 1.835612894605401, -2.814232433915421, 0.5580866084414244, -0.39888258075636746, 1.0067720373950726, 89.28856179584587, 100.1505017925676, 75.08859563899874, 56.17186900925023, 58.62318177268591], [0.65705471074636, 0.3567811825836535, -1.2706486450788506, 1.6328662943053436, -2.370411580355292, 0.8117518824647005, -0.6964089371297943, 0.8340931027382451, 92.3239066452128, 81.00879734355361, 62.59253133455313, 51.909220938644786, 41.17811290698571], [1.3084377708390251, -0.13307533949882747, -0.24351577598222537, 1.793998095391125, -2.41340137952053, -0.22170821503423024, 0.36188912390245714, 1.1331088469265223, 100.06495392605305, 155.3382814224863, 138.50489925494838, 107.85034825208055, 114.29481862515387], [1.2282522647437901, 0.46459413773224745, -1.0912945610620637, 2.33263563675002, -2.564795803893445, 0.1122674446419692, 0.07119193657866271, 0.768551730299904, 88.44598771339933, 76.58745406568244, 57.18071673710202, 23.523992472167627, 17.80925466142816], [1.0484796968605525, -0.05296843638571697, -0.4662472930261504, 1.6320601316311245, -2.232151160161968, -0.02007087513754548, 0.17204535406183843, 1.2044579057643523, 101.38915744287877, 149.4553653383541, 130.58429198360733, 101.70986685920184, 108.8874563392163], [1.3738290456446274, 0.19056929000039574, -0.5928627443943368, 1.6137903636838102, -2.31778267997627, -0.21193226679117916, 0.33956961874565206, 1.4012012146967865, 96.8855379726721, 111.12257036775, 96.01248526508641, 67.98742342945411, 71.6200362665464], [1.292232714530479, 0.06525170594466871, -0.6028821525865787, 1.7306274196128315, -2.8947601111643144, 0.20865745266303787, -0.040798485706829944, 1.2128856603352625, 85.24044067591397, 103.9470753465004, 88.72362324563844, 67.11091871864573, 81.07821717591516], [1.0797376048714538, 0.3072610290487078, -0.8783401995446984, 2.208495745447034, -2.5250540189413084, 0.19758796812259638, -0.09523494996894007, 0.8153118377608732, 96.203736534453, 101.80552156677922, 82.79190270037193, 49.72356054046686, 44.21380017013731], [1.4416740397684364, -0.010040913286582067, -0.14007269794167201, 1.6463977585153304, -1.7205293606365215, -0.10019720521712139, 0.19271772724414266, 0.7599702879017132, 92.65870127655631, 119.3271920344022, 113.02345133226424, 81.1908577905724, 77.42288983763767], [1.1333867607294388, 0.48803933848719766, -1.0263250219729358, 1.784118912570145, -2.5467037273075137, 0.41355737877903187, -0.30426246075757785, 0.8576524158860318, 87.50598964590911, 60.07458543855494, 42.74391400571662, 19.450135786932236, 12.556941288620893], [1.0295777148841183, 0.10561508302934772, -0.6125159214911968, 1.9989920697530363, -2.443309398752874, 0.3571306595547746, -0.2566484437730934, 0.7547843650193024, 92.93169685476236, 114.44326081910022, 96.49745456753308, 69.62231647852974, 70.63595598303287], [1.426618063219196, -0.15592785937749412, -0.0555876673801318, 2.237350666802671, -2.4025505276766523, -0.1139435928313604, 0.24808406778003844, 1.0513169579373178, 86.35617528115466, 142.1168309262587, 125.18922526881684, 90.9657905125626, 101.3409447743001], [0.9788273464588181, -0.2289612062790563, -0.4164842802646353, 1.6348606677555968, -1.9254642706872682, 0.14244882595982053, -0.04840947744290305, 0.9193302274323285, 101.83227540886567, 165.54596739929679, 156.52410737346455, 121.84596055569301, 132.44614057600458], [1.1749773521279792, 0.1923899643910547, -1.0468637371313516, 1.7274593521457, -2.575497895348079, 0.1310024691909859, 0.02147743337777493, 1.1597123455413334, 92.20371276824842, 110.06672709977661, 92.65220238896796, 69.22687791514417, 68.3977854950727], [0.9407014056034988, 0.15971256821611945, -0.915970693601628, 1.8951168034938484, -2.7164157675684124, 0.4352145117449832, -0.2895238276846696, 0.9850881281995961, 92.0630068215914, 115.59873179409193, 89.15691501939511, 66.13196499170041, 70.66039926891817], [1.281272741885229, -0.06813391657802499, -0.41432254426156134, 1.5590026358553888, -2.3600547639423817, -0.153516644642295, 0.3137287035930052, 1.3218204481627849, 96.74815971321432, 147.31528336072424, 126.33720954208067, 99.7711163566419, 106.8192433286374], [0.869265508455485, 0.30416293886791945, -1.216666636312597, 1.8823722016936761, -2.503416872482455, 0.48387991084395626, -0.3520275260489634, 0.879514354462262, 93.66690170140996, 96.94771425989958, 78.55044319494067, 55.31367329064093, 49.70104903898674], [0.9176895470931258, 0.5208892603670885, -1.4676166746100565, 1.7936422385585677, -2.9146435057153663, 0.26475147244520303, -0.10101645552650826, 1.279940672582949, 98.81268611510896, 84.62969683078126, 59.60428049028041, 37.52993051665646, 37.02194018688345], [1.5550096413844996, -0.0036751050827719687, -0.26660136709518445, 2.504972549073045, -2.8252950861096138, -0.10574016548949966, 0.2141603499461666, 0.6894132688409219, 87.14292309117393, 124.63085106973787, 109.49687250864642, 64.71715146887405, 77.94286828954358], [0.678176247723475, 0.015331086970249123, -0.8312161367242176, 1.6869052096803774, -1.1645640328931777, 0.29472803013193366, -0.22165152137628327, 0.9781016863032855, 101.2529610417588, 147.06884774350107, 136.37551254993136, 105.67994732459239, 99.49733247606099], [1.507254192522168, 0.4875528265311708, -1.0012951716338012, 1.6200328800893895, -2.585623920395767, -0.3082821995540738, 0.4825067191389356, 1.3657754827170843, 92.97666843271936, 79.84948581710843, 61.36520573354575, 32.47974536840427, 35.51536390120399], [1.2750163372110255, 0.16571799277827926, -0.6285202636041038, 2.5833234712298223, -2.915922510477616, 0.05944664716758425, 0.06555553972527976, 0.7361898789686102, 91.85722792059275, 115.08227660618324, 95.9477397803647, 53.25035508419271, 59.35365570069348], [1.0326350457154323, 0.170505437854062, -0.8934187832466371, 2.0765239668334603, -2.283935284778951, 0.058573547025098927, 0.05565501676143429, 0.86406379674919, 101.33123182005686, 129.5349588586353, 111.20835439088322, 74.39857122096738, 73.66350672845878], [1.2253996974331747, -0.14593060984943332, -0.19433583598360718, 1.9054719509897546, -2.542535289440718, 0.10333715797267048, 0.005710661384551622, 0.8669325734390486, 95.31528282658567, 141.26873357407257, 126.20423417361994, 95.1404038720797, 107.73226881659377], [1.0695494640476504, 0.07082781355749898, -0.6291376443609842, 2.113607048044935, -3.005635273382092, 0.16679451388605965, 0.02239583911399478, 1.2348950568774504, 93.59023365474675, 127.59456282191047, 101.00591627793914, 72.2715521603929, 85.2680105366041], [1.2040249336188502, 0.14265364742141312, -0.8453864752399344, 1.4762544480134734, -2.5928551925160823, 0.061386094565851694, 0.12200770067852973, 1.3793257745952203, 91.97499994719014, 110.19622046140015, 94.77096246321005, 75.0018670993255, 78.23942577655224], [0.5146502600244678, 0.05432297824368642, -0.9312191831069871, 1.3195632199911704, -1.2662866331343803, 0.6029731686991191, -0.5664962466233311, 0.67620885603084, 107.29534966289357, 136.36363036962365, 128.00490509234348, 105.84267498639512, 96.20654315985232], [1.0733964089891341, 0.1603183236725634, -0.8973329548233194, 1.8743218342919372, -2.5977832479092497, 0.3694161325909619, -0.20590272535652318, 0.9291384418599941, 88.41270182959275, 100.89229494250405, 86.41217352370184, 61.50163642490906, 64.8814847186473], [1.07823768402269, 0.014071549622289747, -0.7080502280054026, 1.842179701649807, -3.0054384158312146, 0.21636506228316343, -0.04787876798236066, 1.3891941693628467, 92.57517296384835, 125.55474276665223, 105.5532949534327, 83.50625319946064, 97.49367744397564], [1.6116127082565332, 0.15545199966677142, -0.43872385567548344, 1.8289033980696752, -2.4943681157371396, -0.29965964317061333, 0.4399367231313422, 1.0574080006508293, 91.35678726419981, 110.39794456988268, 95.95605076273262, 60.63071900767846, 63.669363931220936], [1.1402089300944336, 0.2842847817265538, -0.8821941342878196, 2.7609221511873003, -2.8352226130918465, 0.10438585746174564, 0.050134971625893664, 0.6534671115794003, 93.91222686016627, 109.23301627277623, 86.24886734356059, 42.41320081177106, 46.22865986710812], [1.13344110591779, 0.19868219772610338, -1.0374240631225966, 2.1321749649154955, -2.831441317640997, 0.4156770751362016, -0.2860759172902869, 0.7633652332542884, 86.51848414279044, 107.15953142903575, 80.7121609855682, 53.07216128751877, 57.87570786962339], [1.3513286336320087, -0.041516309719676084, -0.3474870009061069, 2.348131042569806, -2.757225993342618, -0.16199208921904076, 0.30217366151321023, 0.9100542156772788, 95.4931684106814, 142.5379353035939, 125.53583560829207, 83.44716831126416, 94.49850779558072], [1.3320159646313234, -0.0374280748477091, -0.2833257437511261, 2.007127527675724, -2.3379471994543586, -0.0944831963602554, 0.21551888012812773, 0.9511661246276878, 93.2189734663493, 134.44250233212344, 120.39204327151621, 83.76084994866737, 90.52735498227642], [1.031076450727516, 0.13475994278882905, -0.8845309138689357, 1.7694222576677385, -2.4084411256136136, 0.45982688880187733, -0.31941722977906556, 0.8391989560299242, 88.56664637188808, 101.10028370681587, 89.51177806417665, 65.8647159826344, 66.29453184159901], [0.9379851596364037, 0.2881084254657432, -1.2944030009330778, 1.8011816977197668, -2.783305443035784, 0.2867089372141111, -0.09194819734043765, 1.2218483902895987, 94.21567419449426, 103.82210345701849, 84.41738154408391, 62.313109348532315, 61.87384110369115], [1.1569063547690273, 0.03307567521882043, -0.6023657701295686, 1.8862884184898527, -2.425185162339594, -0.09551093898804797, 0.2406749751831612, 1.2321381470522428, 100.17443004696514, 138.2215995103956, 121.27310197329591, 89.44863037706594, 94.56386592553184], [1.5770871190584197, 0.06939533215027793, -0.5123506496669687, 1.9358781937988696, -2.7871926320336993, -0.24039021073403816, 0.39233778486317583, 1.156774353940143, 89.76012324109179, 119.56893051499637, 103.82939984947349, 71.030146522616, 81.30890025558588], [1.6261647471379994, 0.2589975913575634, -0.5237528151903874, 1.8614728669878642, -2.6765603194666077, -0.2895939822959045, 0.4237093791742933, 1.1081159616487648, 90.84627393619898, 96.92940899124099, 81.83788386070357, 47.31214649530606, 50.46932585487093], [1.4047924383318668, 0.26486710894958426, -0.7270917877758923, 2.1214145926572354, -2.718154712245699, -0.14887451766281704, 0.2867335182213926, 1.0799961201096995, 93.29741233710037, 107.47056612814028, 87.22551299143329, 50.73614174181394, 52.40509032790103], [1.2524714991132433, -0.19976962882219668, -0.2931359377625565, 1.628536071340699, -2.7157140989190935, -0.06360149549933411, 0.2300239714228244, 1.4894049902963808, 94.79755987062144, 151.20205727592963, 134.5628765881773, 110.96209975044799, 128.76720016393458], [1.1273877150816085, -0.20236838230793255, -0.314651798078202, 1.7889344239066567, -2.1496137723424016, -0.06421645556392455, 0.18285663939311333, 1.004232917099785, 101.78719550781187, 166.16838186315357, 152.54941473241945, 119.09442176138451, 127.59859512141668], [0.8309575652160233, 0.4163185162142177, -1.460856832095863, 1.867162913405885, -2.7560418498588084, 0.4910243983444891, -0.31931308392849916, 1.0487745156555979, 93.0329488915972, 86.24188899601134, 66.02580557318072, 43.85782543967759, 40.13155237045689], [0.694897545689008, 0.263743923251771, -1.275128023027497, 1.6306096182598546, -2.361751229726659, 0.7018782526943979, -0.5747563846959814, 0.90136900966716, 93.69512871713393, 100.1841831994626, 81.19336791844815, 64.0326918732509, 59.98996291717555], [1.2825251476935184, 0.06160089316327555, -0.6588519391292323, 0.7725696251348444, -2.3243615056731546, 0.22220139968813207, -0.039377959111435074, 1.2703191679557806, 85.14094986105258, 98.83714910451597, 88.32913104931174, 79.69297508255326, 87.417618958324], [0.7908547860132223, 0.3785128997261308, -1.3410277333754668, 2.1225063188081603, -2.6188982055707215, 0.43043421336330795, -0.28326491661555836, 0.8564899077353006, 97.1486218838836, 99.56538325297748, 78.30819599306999, 49.05119860681074, 45.8712848518289], [1.3180236084515502, -0.23663416010718913, -0.23582421446353644, 1.761091681254518, -2.8223356782493014, -0.00654712781373582, 0.16588721070280213, 1.1830544326845562, 92.91484643344765, 153.02857716649982, 136.58293403004603, 107.91475325624657, 126.42545834147539], [1.4378884869707655, -0.4163336406094596, 0.3683023252033708, 1.9080765773954653, -2.2771084005393805, -0.4125388211362994, 0.6131042005937893, 1.3199766535985427, 97.45018577666934, 180.3146787476526, 165.0499603842522, 140.84036702339728, 148.3826962063989], [1.3624248672909989, -0.027588973056500675, -0.3891051984995732, 2.6335387954702676, -3.0881844712097166, -0.024219143129605467, 0.16573876968515674, 0.7692116338120492, 90.6592511490029, 135.15189760311458, 116.32045720516712, 72.19869291363106, 88.77017133537724], [0.9088484301675541, 0.17408029478667444, -0.9998356783979536, 1.6222375853295539, -2.6066574397599784, 0.5360845612166293, -0.3848061027006932, 1.0592610526208786, 89.88259929439572, 99.1415939851178, 82.94757159623433, 66.4629475852047, 68.28258103804944], [1.0541761759217847, 0.06691183620999172, -0.609308287912744, 2.3445097495254554, -2.459740676734543, 0.24562544998236074, -0.13332284869905014, 0.581717892729385, 95.22333696104836, 126.18493449561304, 109.85515195818925, 71.42395316372546, 76.06332658108329], [1.4622578783734885, -0.01795475413713434, -0.22225308597436844, 2.3032600281404436, -2.5405953987683803, -0.1465772563034648, 0.2674097631912288, 0.7681012015649983, 91.2648783987711, 129.7968438201784, 116.22678784232373, 73.14650948234699, 82.70842585053198], [0.9651441686269479, 0.34354692483048643, -0.8950313076068371, 2.2148485020472366, -2.5611944819626467, 0.4551741018960518, -0.3734825134149794, 0.5357780198474774, 94.78342659554761, 90.7010257239446, 70.90813764021485, 42.377268667604994, 34.73292850977442], [0.8251000067014183, 0.23444095245130603, -1.1335874621259814, 1.7161831122245446, -2.6238039864006013, 0.6110019268960054, -0.4658545846145698, 1.007111740140073, 90.99177174609933, 97.76960939649781, 78.07578402442195, 61.095408235937725, 60.98580509037467], [0.6790906704582343, 0.36938889012821674, -1.2009316055247672, 1.7132993288901157, -2.0869729456011306, 0.6183689929098749, -0.5276059458873347, 0.7467530804767486, 98.45725588932287, 91.8073938779366, 74.15360947224505, 56.06056055529549, 42.818390506925134], [1.3963060439756634, -0.042584012510543015, -0.22921462629678474, 1.4733275341171312, -1.8361300578047832, -0.07743201235522042, 0.19928366998692004, 0.9688283161820749, 92.22698610196554, 122.37310988120936, 115.36080539210162, 87.45242021223488, 88.19292520105961], [1.3766837064370554, -0.05388333994199556, -0.1147515474218684, 2.5611426423829955, -2.680520407279585, -0.047598096507773094, 0.13594085020268515, 0.5728286518504117, 93.61770992077693, 137.6566109699581, 120.7647610948761, 75.09755975188882, 85.8038595299041], [1.455708429345398, 0.008019536696587238, -0.16235505563050945, 2.038512810255782, -2.41583410421426, -0.22293770327872678, 0.32181364203628227, 1.0555074790879249, 95.51576932975478, 129.04965579910993, 114.08041646387315, 78.6725217791327, 83.14666372142854], [2.0686695116709775, 0.35997895719169964, -0.30131297491736675, 1.4875423365313443, -3.4901991749569827, -0.712284236314877, 0.8715610938740345, 1.2021223894497022, 102.02845749107712, 87.77063727168267, 65.13988242715244, 32.6148839885398, 47.4958330857253], [0.9442310845602951, 0.04400503574417752, -0.6268687095995397, 1.9881184603147666, -2.3630919149364673, 0.2863605885881578, -0.17778104436204697, 0.8791610915135676, 98.08023850959557, 134.79936656495153, 111.86219428878822, 82.65385361834953, 87.50558272483629], [1.2537164263028708, 0.17253982275585866, -0.8963975536624439, 2.0271012838167763, -2.8615515987246063, -0.0717977270410777, 0.2596768074281483, 1.1991691468850196, 94.01187340132715, 121.57318561365109, 100.87351469528008, 69.49577950812487, 72.90455050188915], [0.7333147795912917, 0.36853380242728573, -1.1186981695180742, 2.06300219107494, -2.2713283995220994, 0.6159256972619123, -0.537677393298084, 0.5614368473130908, 97.19629518970174, 92.3179773372045, 73.32414161819702, 49.2086267326706, 37.96358120065078], [0.563393445347373, 0.5640556986244215, -1.551482426485635, 2.0962233738625624, -2.681769620190156, 0.7838593447366203, -0.667007952475428, 0.6305588596312742, 98.6304934738409, 73.33871722381053, 48.49988706853224, 29.186181630431506, 17.618813862248395], [1.2599000371972453, -0.02013313291340044, -0.34335939714430563, 2.4318546247603607, -2.583892936533312, -0.051369168758146046, 0.16447539462429994, 0.6916489055513076, 96.67144613466017, 140.80686185765387, 124.11935034741937, 78.94433472941006, 89.12375220724529], [0.9616644644990625, 0.1322065983269875, -0.8627188519736415, 1.9831817761982815, -2.5469543651610222, 0.26732642570464415, -0.1254090245256876, 0.9352124747123988, 96.45047396566648, 121.39741203387499, 102.94544450481072, 72.77018681862502, 77.6001902869614], [1.0968799377460414, 0.1977194005029014, -0.9438379481026622, 1.8210868063217205, -2.65792287977391, 0.17480384580355604, -0.008336510747715005, 1.1293540876803478, 93.08585599246025, 108.85971561552495, 91.59004713331967, 65.5546336212891, 66.81846059528812], [1.6397116849733817, 0.037874779915897896, -0.1658457677965601, 2.1591360800442945, -2.561725290782182, -0.2147498546587094, 0.32802250732595917, 0.7777200065814978, 88.54496705244462, 116.54740660857063, 103.74804195569243, 61.96920704943029, 72.59516753237037], [1.383579523358263, -0.12679364760379158, -0.30281542340750783, 1.9414941672953596, -2.2988836880529653, -0.30777395798417967, 0.4859804495530372, 1.3027472632575712, 96.40344121485177, 150.52085931438543, 136.59601640753252, 103.34479826403457, 109.88883176038782], [1.1387328546984163, -0.1889505014693122, -0.16606458603402155, 1.3863627952001463, -1.9562267636985127, 0.024635235344190202, 0.08705937224242855, 1.14474109343551, 98.8144800716848, 148.48214364584126, 137.25583778377185, 117.31905440111242, 120.60091528812018], [1.0887615377441118, -0.06365079690752114, -0.5835979789877517, 1.6888003963930158, -2.2097038682506023, 0.1042906692303891, -0.0050082762955667845, 1.1990828398177844, 99.25796989830712, 146.4076845952354, 129.15265485962263, 99.95051810441808, 104.89728756164129], [1.1179661807942585, 0.2203156027748997, -0.924150092773046, 2.3645027526361533, -3.0523043855443728, 0.26775076460461733, -0.11097792511647325, 0.900735421424577, 90.01352077868775, 109.44457858719043, 84.52146413080669, 50.98300122019333, 57.36391540228729], [1.0728544483427707, 0.10772150413306815, -0.8382891045570776, 2.097672760788931, -2.85914377127937, 0.22469266692113563, -0.0585308734096836, 1.049022684026515, 92.52813941131853, 119.14393404698856, 100.23160621524161, 70.87011474124073, 78.75561451155617], [1.3267253620865735, -0.1104474927776786, -0.3010789097464591, 1.814709648834649, -2.577816884596089, -0.07859970289696153, 0.2327094247188941, 1.1503984318551665, 93.08113991785656, 139.12208231926172, 125.04867499363282, 94.8240668685049, 107.91277129053745], [1.2196406265666366, 0.4374871957703738, -0.8392264776196663, 2.409671471957696, -2.7289351371310486, 0.12114007571526993, -0.014280451591587435, 0.7229047344038215, 93.38236421471422, 83.89124768979866, 61.58915986597128, 23.497844824619115, 20.79090048974474], [0.8673024694692467, -0.198705454838275, -0.21041273401843516, 1.1803118546637033, -1.4676396957275388, 0.23201116919831785, -0.1607757820372971, 0.9935840989163228, 104.19237236629169, 160.56467340024867, 143.34412069144327, 125.17309509339601, 126.28826417564652], [1.5119552956863678, -0.18994631091663725, -0.20469866765694766, 2.0223380565272118, -2.1841799564581432, -0.2329938918139878, 0.42287194389110117, 0.9820067433190557, 86.80498827399153, 144.10796166958033, 135.37808025633467, 99.40382173706847, 108.2822856464905], [1.1612463074742319, 0.26769416002093305, -0.8463245001675924, 1.734275243819911, -2.51716283105377, 0.20805233248429536, -0.08011580107353108, 1.1231776101113469, 91.79094856571774, 93.14994229814812, 77.00276643996408, 54.640809367143135, 51.1121776636853], [0.8055990466917002, -0.1989362743354905, -0.35596392634800017, 1.1030509191725197, -1.298017549249054, 0.35588395559738933, -0.3081380697959131, 0.8993954025969217, 103.47133153173922, 152.63751166703574, 147.34343853800615, 126.98146096129788, 125.40141336839113], [1.3385776527086952, -0.09712754141862527, -0.18921564856298542, 2.229520823726599, -2.5862052324812206, -0.09180519768335013, 0.2125391624862228, 0.8459661220163398, 94.43050204714247, 144.73870461045001, 127.17032822907215, 86.56774269403552, 99.12652019424095], [1.1586500502955759, 0.42894424497631634, -1.1527428721069923, 1.392032878715516, -2.3741952921856653, 0.1820961370609004, -0.03407766237303448, 1.240145825562898, 91.70473234278373, 77.51034448621324, 61.30522052585328, 43.50575237901882, 38.63751589487365], [0.9564692694353015, 0.19277027762164858, -1.1438758405123899, 1.5807071078023358, -2.5718607374187124, 0.4243692091408028, -0.2669012491158087, 1.1331051899181355, 91.2837508038526, 103.14269549317778, 88.10726626658256, 68.47501615012898, 69.34070754818441], [1.1104298688800862, 0.3094583314316289, -0.9377529170410832, 2.2958566020087328, -2.822822954831622, 0.1675833892784006, -0.03437888689732251, 0.8359597446989049, 94.55169536069482, 102.78778277746282, 81.77473146747813, 46.62540085401749, 45.99077400203352], [1.34869104799901, 0.20067208517059149, -0.29624043047505505, 2.5030391410017305, -2.4356242738510248, -0.02912759438771411, 0.08813903786678601, 0.463554855438854, 95.44975882497423, 110.88685117497425, 92.3833538876352, 51.07273130304404, 45.32784631659684], [1.2451487383544968, -0.050061627567397265, -0.7363490170932242, 1.62858159852686, -2.637094887565388, -0.21125547987965623, 0.39632561956227, 1.4207398983739534, 98.98349026606232, 150.63180913274073, 135.5838523021731, 107.31974942127611, 112.6692977449575], [1.1068673884307865, -0.012484003430979359, -0.5305792869471933, 2.088393777479767, -2.6452219902578165, 0.17810422812507715, -0.04188740752542613, 0.9007794784860285, 94.21686876391894, 132.18539025454638, 114.78292566983957, 81.61664823042786, 92.56536909723432], [0.8745083412882011, 0.5064035569916483, -1.4707649537619254, 1.7647158358231994, -2.718960903088472, 0.6855456803853183, -0.5288427823646092, 0.9576807071724623, 85.7672718213434, 58.9226274270555, 41.00315137552681, 23.42871719255388, 16.40553628260039], [1.066758921394331, -0.020082231625552484, -0.5774874621143938, 1.852995530673081, -2.653341654569988, 0.225425750859314, -0.08034096127765766, 1.2364005274934695, 93.81975650363518, 127.98423583761365, 110.56062203538234, 85.67447479338675, 96.93747059759492], [0.9152236837351978, 0.2224944362884378, -1.0837177311973547, 1.7206745635687273, -2.822921893286977, 0.5296978421187257, -0.3505667724996553, 1.129641368760434, 88.32185162569105, 96.49416730647164, 75.65080844048747, 58.63611601754438, 62.55644367370282], [1.2781260544377635, 0.1620481401205422, -0.29806915191050104, 2.129584328338798, -2.1210458855114442, 0.08060047249068054, -0.04240861862697429, 0.5365341301162939, 95.67413971637166, 109.81754569389864, 95.42581245027549, 61.06224969383115, 51.58135977857045], [1.1171978241553209, -0.20133808842074247, -0.2202790661868261, 1.1020255212187537, -1.8645329338331653, 0.1361134838920573, -0.022587210520797915, 1.1842290795322576, 96.16805965949156, 142.58330009084906, 133.99188866788523, 117.84157217710225, 122.04662162583215], [0.914493341561159, 0.39672678257781246, -1.3005173842809066, 2.5854943144472333, -3.1591863707959225, 0.36729235214324174, -0.19335258542544467, 0.784889611875822, 93.63354599134051, 97.83630421331706, 71.30556277782273, 36.30938535244978, 39.1793932001034], [0.7615910763025368, 0.3577766719557999, -1.4070166615258053, 1.7953205977879967, -2.736194891275729, 0.8059146309593224, -0.66010832717423, 0.8802625429122533, 87.3946247996586, 77.88764361329234, 59.720654643444625, 44.31192395490257, 39.39909443610544], [1.1644733371120257, 0.33019176004676953, -0.8981173469122636, 2.5910865247257764, -2.964783232475021, 0.09120259898881784, 0.05254694969345469, 0.733815157156232, 94.40812993291651, 103.69349153107026, 79.92849757833397, 39.58475382986087, 40.77152803435574], [0.6816986832968683, 0.5339699816103304, -1.7016316707470303, 1.9388844199697666, -2.9187916343089118, 0.811615724565874, -0.6450630280827719, 0.9152428915271541, 89.03592133108945, 65.09268577573042, 43.251027449852735, 25.040634051132155, 20.234694696781197], [0.9475559727105743, 0.056712386779398716, -0.71251212953359, 2.1531440568827245, -2.406717719384638, 0.32458176914501197, -0.22284276285833954, 0.6761377299424411, 97.13093111419532, 133.754293417853, 113.13923757512724, 78.84706810472225, 82.79422247913854]]
+    compare_solutions_on_different_datasets("data/cwk_train.csv", "data/cwk_test.csv", SOLUTIONS)
\ No newline at end of file
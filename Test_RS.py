@@ -1,21 +1,26 @@
 import statistics
 import time
 import csv
-from Pallets import Pallets
+from Experiment_Runner import run_random_search_trials
 
 FILE = "data/cwk_train.csv"
 OUTPUT = "data/test_results_random_search.csv"
 
 fieldnames_rs = ['Runs','Run Time', 'Lower Bound', 'Upper Bound', 'Mean', 'Standard Deviation', 'Costs', 'Solutions']
 
-def test_random_search(runs: int, run_time: int, lower = -1.0, upper = 1.0):
-    pallet_prob = Pallets(FILE)
-    
+def test_random_search(runs: int, run_time: int, lower = -1.0, upper = 1.0, workers = 1, seed = None, max_evaluations = None, block_size = None, store = None):
     results = []
     result_costs = []
 
-    for i in range(runs):
-        result = pallet_prob.timed_random_search(run_time, lower, upper)
+    # Optionally stream every run into a Result_Store as soon as it finishes
+    on_result = None
+    if store is not None:
+        name = f"random_search_time_{run_time}_bounds_{lower}_{upper}_evals_{max_evaluations}_block_{block_size}"
+        configuration = {'Run Time' : run_time, 'Lower Bound' : lower, 'Upper Bound' : upper, 'Max Evaluations' : max_evaluations,
+                         'Block Size' : block_size}
+        on_result = lambda result : store.append(name, result[0], result[1], configuration)
+
+    for result in run_random_search_trials(FILE, runs, run_time, lower, upper, workers, seed, max_evaluations, block_size, on_result):
         results.append(result[1])
         result_costs.append(result[0])
 
@@ -29,11 +34,11 @@ def test_random_search(runs: int, run_time: int, lower = -1.0, upper = 1.0):
     print("Test Complete!")
 
 
-test_random_search(100, 15)
-test_random_search(100, 60)
-
-test_random_search(100, 15, -2.0, 2.0)
-test_random_search(100, 15, -5.0, 5.0)
-test_random_search(100, 15, -10.0, 10.0)
-test_random_search(100, 15, -30.0, 30.0)
+if __name__ == "__main__":
+    test_random_search(100, 15)
+    test_random_search(100, 60)
 
+    test_random_search(100, 15, -2.0, 2.0)
+    test_random_search(100, 15, -5.0, 5.0)
+    test_random_search(100, 15, -10.0, 10.0)
+    test_random_search(100, 15, -30.0, 30.0)